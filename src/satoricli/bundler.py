@@ -1,33 +1,19 @@
+import hashlib
 import io
+import json
 from pathlib import Path
+from typing import Optional
 from zipfile import ZipFile
 
-import yaml
-from satorici.validator import is_import_group, is_input_group, is_test
-
-
-def get_local_files(config: dict):
-    paths = {"imports": set(), "inputs": set()}
-    for value in config.values():
-        if is_import_group(value):
-            paths["imports"].update([p[7:] for p in value if p.startswith("file")])
-        elif is_input_group(value):
-            paths["inputs"].update(
-                [
-                    p.get("file")
-                    for p in value[0]
-                    if isinstance(p, dict) and p.get("file")
-                ]
-            )
-        elif is_test(value):
-            subtest_files = get_local_files(value)
-            paths["imports"].update(subtest_files["imports"])
-            paths["inputs"].update(subtest_files["inputs"])
-    return paths
-
-
-def get_references(stream, dir):
-    file_list = get_local_files(yaml.safe_load(stream))
+from .cache import CACHE_DIR, atomic_write, cache_enabled, prune, read_cached
+from .validations import ImportGraph, import_graph
+
+BUNDLE_CACHE_DIR = CACHE_DIR / "bundles"
+BUNDLE_CACHE_MAX_ENTRIES = 64
+
+
+def get_references(graph: ImportGraph, dir):
+    file_list = graph.local_files()
 
     for key, files in file_list.items():
         for path in files:
@@ -37,14 +23,69 @@ def get_references(stream, dir):
     return file_list
 
 
+def bundle_key(playbook: bytes, base_dir: Path) -> str:
+    """Content address of a playbook resolved against base_dir"""
+
+    digest = hashlib.sha256(str(base_dir.resolve()).encode())
+    digest.update(b"\0")
+    digest.update(playbook)
+    return digest.hexdigest()
+
+
+def _file_signatures(base_dir: Path, paths: set[str]) -> dict[str, list[int]]:
+    signatures = {}
+    for path in paths:
+        stat = Path(base_dir, path).stat()
+        signatures[path] = [stat.st_mtime_ns, stat.st_size]
+    return signatures
+
+
+def _load_cached_bundle(key: str, base_dir: Path) -> Optional[bytes]:
+    index = read_cached(BUNDLE_CACHE_DIR / f"{key}.json")
+    if index is None:
+        return None
+
+    try:
+        files: dict[str, list[int]] = json.loads(index)["files"]
+        if _file_signatures(base_dir, set(files)) != files:
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return read_cached(BUNDLE_CACHE_DIR / f"{key}.zip")
+
+
+def _store_bundle(key: str, base_dir: Path, paths: set[str], data: bytes) -> None:
+    try:
+        index = json.dumps({"files": _file_signatures(base_dir, paths)})
+        atomic_write(BUNDLE_CACHE_DIR / f"{key}.zip", data)
+        atomic_write(BUNDLE_CACHE_DIR / f"{key}.json", index.encode())
+    except OSError:
+        return
+
+    prune(BUNDLE_CACHE_DIR, "*.zip", BUNDLE_CACHE_MAX_ENTRIES)
+    prune(BUNDLE_CACHE_DIR, "*.json", BUNDLE_CACHE_MAX_ENTRIES)
+
+
 def make_bundle(playbook: Path, base_dir: Path):
+    content = playbook.read_bytes()
+    use_cache = cache_enabled()
+
+    if use_cache:
+        key = bundle_key(content, base_dir)
+        if (cached := _load_cached_bundle(key, base_dir)) is not None:
+            return io.BytesIO(cached)
+
     obj = io.BytesIO()
-    with open(playbook) as f, ZipFile(obj, "x") as zip_file:
-        references = get_references(f.read(), base_dir)
-        zip_file.write(playbook, ".satori.yml")
+    references = get_references(import_graph(playbook), base_dir)
+    with ZipFile(obj, "x") as zip_file:
+        zip_file.writestr(".satori.yml", content)
         for _key, paths in references.items():
             for path in paths:
                 zip_file.write(base_dir / path, path)
 
+    if use_cache:
+        _store_bundle(key, base_dir, set().union(*references.values()), obj.getvalue())
+
     obj.seek(0)
     return obj
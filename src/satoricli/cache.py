@@ -0,0 +1,68 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path.home() / ".satori/cache"
+
+
+def cache_enabled() -> bool:
+    """Local caches can be disabled with SATORI_CLI_NO_CACHE=1"""
+
+    return os.environ.get("SATORI_CLI_NO_CACHE") != "1"
+
+
+def atomic_write(path: Path, data: bytes, mode: int = 0o666) -> None:
+    """Write data to path so concurrent readers never see a partial file.
+
+    mode is applied to the new file, minus the umask.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+
+def read_cached(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def prune(directory: Path, pattern: str, max_entries: int) -> None:
+    """Remove the least recently modified files matching pattern"""
+
+    try:
+        entries = sorted(
+            directory.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True
+        )
+        for entry in entries[max_entries:]:
+            entry.unlink()
+    except OSError:
+        pass
+
+
+def prune_size(directory: Path, pattern: str, max_bytes: int) -> None:
+    """Remove the least recently modified files matching pattern until the
+    rest fit in max_bytes"""
+
+    try:
+        entries = sorted(
+            ((path.stat(), path) for path in directory.glob(pattern)),
+            key=lambda entry: entry[0].st_mtime,
+            reverse=True,
+        )
+        total = 0
+        for stat, path in entries:
+            total += stat.st_size
+            if total > max_bytes:
+                path.unlink()
+    except OSError:
+        pass
@@ -1,5 +1,7 @@
-import re
+import json
 import sys
+import subprocess
+import time
 from datetime import datetime
 from importlib import metadata
 from os import environ
@@ -8,36 +10,103 @@ import httpx
 from packaging import version
 
 from ..api import configure_client
+from ..cache import CACHE_DIR, atomic_write
 from ..exceptions import SatoriRequestError
 from ..utils import load_config
-from .commands.config import ConfigCommand
-from .commands.playbooks import PlaybooksCommand
 from .commands.root import RootCommand
-from .commands.shards import ShardsCommand
-from .utils import configure_console_width, console, error_console, log, logging
+from .utils import (
+    close_export,
+    configure_console_width,
+    error_console,
+    log,
+    logging,
+    start_export,
+)
 
 VERSION = metadata.version("satori-ci")
 
 CLIENT_CONFIG_KEYS = frozenset({"token", "host", "timeout", "team", "default_team"})
+UPDATE_CHECK_FILE = CACHE_DIR / "update-check.json"
+UPDATE_CHECK_TTL = 24 * 60 * 60  # once a day
+UPDATE_RETRY_TTL = 60 * 60  # after a failed check, retry within the hour
+UPDATE_CHECK_SCRIPT = "from satoricli.cli import fetch_latest_version as f; f()"
+
+# Commands that can run without a configured profile
+NO_PROFILE_COMMANDS = frozenset({"config", "shards"})
 
 
 def _client_config(config: dict) -> dict:
     return {k: v for k, v in config.items() if k in CLIENT_CONFIG_KEYS}
 
 
-def check_for_update():
-    """Verify the current version and the latest version"""
+def is_local(args: dict) -> bool:
+    """Commands that only read local files, or public data, without a profile"""
+
+    name, action = args["func"].name, args.get("action")
+    return (
+        # playbooks --public and playbook --public
+        (args["public"] and name in ("playbooks", "playbook"))
+        or (name == "playbooks" and action == "search")
+        or (name == "reports" and action in ("query", "open"))
+    )
+
+
+def fetch_latest_version() -> None:
+    """Store the latest version published on PyPI in the update check cache"""
 
     try:
-        response = httpx.get("https://pypi.org/pypi/satori-ci/json")
+        response = httpx.get("https://pypi.org/pypi/satori-ci/json", timeout=5)
         response.raise_for_status()
+        latest = response.json()["info"]["version"]
+        payload = {"version": latest, "checked": time.time()}
+        atomic_write(UPDATE_CHECK_FILE, json.dumps(payload).encode())
     except Exception:
         log.warning("Unable to get latest version.")
-        return
 
-    latest = response.json()["info"]["version"]
 
-    if version.parse(latest) > version.parse(VERSION):
+def check_for_update():
+    """Verify the current version against the cached latest version
+
+    The cached version is refreshed by a detached process once it expires so
+    the check never delays the command, even if it exits right away. The
+    attempt is stored first, a failed refresh is retried after
+    UPDATE_RETRY_TTL instead of on every command.
+    """
+
+    try:
+        cached: dict = json.loads(UPDATE_CHECK_FILE.read_bytes())
+        checked = float(cached["checked"])
+        latest = str(cached["version"]) if cached.get("version") else None
+        attempted = float(cached.get("attempted", 0))
+    except Exception:
+        checked, latest, attempted = 0.0, None, 0.0
+
+    now = time.time()
+    if now - checked > UPDATE_CHECK_TTL and now - attempted > UPDATE_RETRY_TTL:
+        payload = {"version": latest, "checked": checked, "attempted": now}
+        command = [sys.executable, "-c", UPDATE_CHECK_SCRIPT]
+        try:
+            atomic_write(UPDATE_CHECK_FILE, json.dumps(payload).encode())
+            if sys.platform == "win32":
+                subprocess.Popen(
+                    command,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    creationflags=subprocess.DETACHED_PROCESS,
+                )
+            else:
+                subprocess.Popen(
+                    command,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+        except OSError:
+            log.warning("Unable to get latest version.")
+
+    if latest and version.parse(latest) > version.parse(VERSION):
         error_console.print(
             f"[bold yellow]Newer version available v{latest}, update with: satori update[/]"
         )
@@ -78,17 +147,18 @@ def main():
         if config and "width" in config:
             configure_console_width(config["width"])
     except Exception as e:
-        if not isinstance(args["func"], ConfigCommand) and not isinstance(
-            args["func"], ShardsCommand
-        ):
+        if args["func"].name not in NO_PROFILE_COMMANDS:
             error_console.print(
                 f"[error]ERROR:[/] Your .satori_credentials.yml file is corrupted or not found."
             )
             sys.exit(1)
         else:
-            config = None
+            full_config, config = {}, None
 
     if config:
+        # --team wins, the team of a legacy profile is the fallback
+        config["team"] = args["team"] or config.get("team")
+        args["default_visibility"] = config.get("default_visibility")
         try:
             configure_client(**_client_config(config))
         except Exception as e:
@@ -96,21 +166,14 @@ def main():
                 f"[error]ERROR:[/] Cannot find your profile in your .satori_credentials.yml file. Is it corrupted?"
             )
             sys.exit(1)
-    elif (
-        not isinstance(args["func"], ConfigCommand)
-        and not (
-            # allow playbooks --public
-            args["public"] and isinstance(args["func"], PlaybooksCommand)
-        )
-        and not isinstance(args["func"], ShardsCommand)
-    ):
+    elif args["func"].name not in NO_PROFILE_COMMANDS and not is_local(args):
         # Allow config cmd only if profile not found
         error_console.print(f"[error]ERROR:[/] Profile {args['profile']} not found.")
 
-        if config := load_config(args.get("config")):
+        if full_config:
             error_console.print("These are the profiles available:")
 
-            for key in config:
+            for key in full_config:
                 error_console.print(key)
         else:
             error_console.print(
@@ -118,34 +181,11 @@ def main():
             )
         sys.exit(1)
 
-    if config:
-        config["team"] = args["team"]
-        args["default_visibility"] = config.get("default_visibility")
-        try:
-            configure_client(**_client_config(config))
-        except Exception as e:
-            error_console.print(
-                f"[error]ERROR:[/] Cannot find your profile in your .satori_credentials.yml file. Is it corrupted?"
-            )
-            sys.exit(1)
+    if args["export"]:
+        start_export(args["export"])
 
     try:
         exit_code = root.run(args)
-        export = args["export"]
-        if export:
-            if export == "html":
-                content = console.export_html()
-            elif export == "svg":
-                content = console.export_svg(title="satori-cli")
-                # remove non xml utf-8 chars
-                regex = (
-                    r"[^\x09\x0A\x0D\x20-\xFF\x85\xA0-\uD7FF\uE000-\uFDCF\uFDE0-\uFFFD]"
-                )
-                content = re.sub(regex, "", content, flags=re.MULTILINE)
-            else:
-                content = console.export_text()
-            with open(f"output.{export}", "w") as f:
-                f.write(content)
         sys.exit(exit_code)
     except SatoriRequestError as e:
         error_console.print(f"ERROR: {e}")
@@ -157,3 +197,5 @@ def main():
         else:
             error_console.print(e)
         sys.exit(1)
+    finally:
+        close_export()
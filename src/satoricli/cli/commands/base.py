@@ -1,16 +1,54 @@
 from abc import ABC, abstractmethod
-from argparse import ArgumentParser
-from typing import Optional
+from argparse import ArgumentParser, _SubParsersAction
+from collections.abc import Callable
+from functools import partial
+from importlib import import_module
+from typing import Optional, Union, cast
 
 from rich import print
 
 
+class LazyCommand:
+    """Subcommand declared by name, its module is imported only when selected"""
+
+    def __init__(self, name: str, target: str):
+        self.name = name
+        self.target = target  # "module:Class", relative to this package
+
+    def load(self) -> type["BaseCommand"]:
+        module, _, attr = self.target.partition(":")
+        return getattr(import_module(module, __package__), attr)
+
+    def __call__(self, **kwargs):
+        # Used as default subcommand, run it without a parent parser
+        return self.load()()(**kwargs)
+
+
+class LazySubParsersAction(_SubParsersAction):
+    """Subparsers action that builds the parser of a lazy subcommand once it
+    is selected on the command line"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loaders: dict[str, Callable[[], object]] = {}
+
+    def replace_parser(self, name: str, **kwargs) -> ArgumentParser:
+        del self._name_parser_map[name]
+        return self.add_parser(name, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if values and (loader := self.loaders.pop(values[0], None)):
+            loader()
+
+        super().__call__(parser, namespace, values, option_string)
+
+
 class BaseCommand(ABC):
-    subcommands: tuple[type["BaseCommand"]] = ()
+    subcommands: tuple[Union[type["BaseCommand"], LazyCommand], ...] = ()
     name: str
     options: tuple[ArgumentParser] = ()
     global_options: tuple[ArgumentParser] = ()
-    default_subcommand: Optional[type["BaseCommand"]]
+    default_subcommand: Union[type["BaseCommand"], LazyCommand, None]
 
     def __init__(
         self,
@@ -30,14 +68,26 @@ class BaseCommand(ABC):
         default_func = None
 
         if self.subcommands:
-            self._subparsers = parser.add_subparsers()
+            self._subparsers = cast(
+                LazySubParsersAction,
+                parser.add_subparsers(action=LazySubParsersAction),
+            )
 
             for subcommand in self.subcommands:
-                subparser = self._subparsers.add_parser(
-                    subcommand.name, parents=subcommand.options + self.global_options
-                )
-
-                _subcommand = subcommand(subparser, self)
+                if isinstance(subcommand, LazyCommand):
+                    # Placeholder so argparse accepts the name, the real parser
+                    # is built by load_subcommand when it is selected
+                    self._subparsers.add_parser(subcommand.name)
+                    self._subparsers.loaders[subcommand.name] = partial(
+                        self.load_subcommand, subcommand
+                    )
+                    _subcommand = subcommand
+                else:
+                    subparser = self._subparsers.add_parser(
+                        subcommand.name,
+                        parents=subcommand.options + self.global_options,
+                    )
+                    _subcommand = subcommand(subparser, self)
 
                 if subcommand is self.default_subcommand:
                     default_func = _subcommand
@@ -45,6 +95,13 @@ class BaseCommand(ABC):
         self._parser.set_defaults(func=default_func or self)
         self.register_args(self._parser)
 
+    def load_subcommand(self, lazy: LazyCommand) -> "BaseCommand":
+        subcommand = lazy.load()
+        subparser = self._subparsers.replace_parser(
+            subcommand.name, parents=subcommand.options + self.global_options
+        )
+        return subcommand(subparser, self)
+
     def help(self) -> str:
         ...
 
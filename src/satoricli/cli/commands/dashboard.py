@@ -2,12 +2,13 @@ from argparse import ArgumentParser
 
 from satoricli.api import client
 from satoricli.cli.utils import (
-    BootstrapTable,
     autoformat,
     autotable,
     console,
     date_formatter,
+    write_json,
 )
+from satoricli.models import BootstrapTable
 
 from .base import BaseCommand
 from .reports import ReportsCommand
@@ -32,7 +33,7 @@ class DashboardCommand(BaseCommand):
         else:
             data = client.get("/dashboard")
             if print_json:
-                console.print_json(data.text)
+                write_json(data.content)
                 return
             self.generate_dashboard(data.json(), pending)
 
@@ -15,7 +15,6 @@ from pathlib import Path
 from typing import Literal, Optional, Union, get_args
 
 import httpx
-import yaml
 from msgspec import msgpack
 from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 from satori_runner import run
@@ -25,6 +24,9 @@ from satoricli.api import WS_HOST, client, ssl_ctx
 from satoricli.bundler import make_bundle
 from satoricli.cli.commands.report import ReportCommand
 from satoricli.cli.utils import log
+from satoricli.models import CommandOutput, Output, ReportResult
+from satoricli.report_cache import get_report, invalidate
+from satoricli.utils import load_playbook
 from satoricli.validations import validate_parameters
 
 from ..utils import (
@@ -280,7 +282,7 @@ class LocalCommand(BaseCommand):
                 bundle = None
             elif (playbook and os.path.isfile(playbook)) or os.path.isfile(target):
                 path = Path(playbook or target)
-                config = yaml.safe_load(path.read_bytes())
+                config = load_playbook(path)
 
                 if not validate_config(
                     path, set(parsed_data.keys()) if parsed_data else set()
@@ -290,7 +292,7 @@ class LocalCommand(BaseCommand):
                 bundle = make_bundle(path, path.parent)
             elif os.path.isdir(target):
                 playbook_path = workdir / ".satori.yml"
-                config = yaml.safe_load(playbook_path.read_bytes())
+                config = load_playbook(playbook_path)
 
                 if not validate_config(
                     playbook_path, set(parsed_data.keys()) if parsed_data else set()
@@ -299,7 +301,7 @@ class LocalCommand(BaseCommand):
 
                 bundle = make_bundle(playbook_path, playbook_path.parent)
 
-                if missing_ymls(config, str(workdir)):
+                if missing_ymls(playbook_path):
                     log.warning(
                         "There are some .satori.yml outside the root "
                         "folder that have not been imported."
@@ -434,21 +436,21 @@ class LocalCommand(BaseCommand):
                         original = message.get("value")
                         if isinstance(original, list):
                             original = " ".join(original)
-                        entry = {
-                            "path": path,
-                            "original": original,
-                            "testcase": {
+                        entry = Output(
+                            path=path,
+                            original=original,
+                            testcase={
                                 k: _redact(v)
                                 for k, v in (message.get("testcase") or {}).items()
                             },
-                            "output": {
-                                "return_code": output_dict["return_code"],
-                                "stdout": _redact(output_dict["stdout"]),
-                                "stderr": _redact(output_dict["stderr"]),
-                                "os_error": _redact(output_dict["os_error"]),
-                                "time": output_dict["time"],
-                            },
-                        }
+                            output=CommandOutput(
+                                return_code=output_dict["return_code"],
+                                stdout=_redact(output_dict["stdout"]),
+                                stderr=_redact(output_dict["stderr"]),
+                                os_error=_redact(output_dict["os_error"]),
+                                time=output_dict["time"],
+                            ),
+                        )
                         if filter_tests:
                             filtered = run_test_filter(filter_tests, [entry])
                             if not filtered:
@@ -486,13 +488,14 @@ class LocalCommand(BaseCommand):
             if output and not stream_output:
                 print_output(report_id, kwargs["json"], filter_tests, text_format)
 
-            report_data = client.get(f"/reports/{report_id}").json()
+            report_data = get_report(report_id, type=ReportResult)
 
             if run_tests:
                 # clean report data if --run is used
                 client.delete(f"/reports/{report_id}")
+                invalidate(report_id)
 
-            return 0 if report_data["fails"] == 0 else 1
+            return 0 if report_data.fails == 0 else 1
         finally:
             os.chdir(original_cwd)
             if temp_clone_dir and temp_clone_dir.exists():
@@ -4,7 +4,6 @@ from typing import Literal, Optional
 from satoricli.api import client
 from satoricli.cli.utils import (
     VISIBILITY_VALUES,
-    BootstrapTable,
     autoformat,
     autotable,
     console,
@@ -13,6 +12,8 @@ from satoricli.cli.utils import (
     execution_time,
     remove_keys_list_dict,
 )
+from satoricli.models import BootstrapTable
+from satoricli.report_cache import clear
 
 from .base import BaseCommand
 
@@ -49,6 +50,8 @@ class MonitorCommand(BaseCommand):
     ):
         if action == "delete":
             client.delete(f"/monitors/{id}", params={"clean": clean})
+            if clean:
+                clear()
             console.print("Monitor deleted")
             return 0
         elif action == "show":
@@ -79,12 +82,14 @@ class MonitorCommand(BaseCommand):
                 f"/monitors/{id}",
                 json={"visibility": action2.upper()},
             ).json()
+            clear()
         elif action in ("start", "stop"):
             client.patch(f"/monitors/{id}/{action}")
             console.print(f"Monitor {'stopped' if action == 'stop' else 'started'}")
             return 0
         elif action == "clean":
             client.delete(f"/monitors/{id}/reports")
+            clear()
             console.print("Monitor reports cleaned")
             return 0
 
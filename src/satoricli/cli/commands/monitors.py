@@ -2,10 +2,10 @@ from argparse import ArgumentParser
 
 from satoricli.api import client
 from satoricli.cli.utils import (
-    BootstrapTable,
     autoformat,
     autotable,
     console,
+    decode_table,
     group_table,
 )
 
@@ -29,7 +29,7 @@ class MonitorsCommand(BaseCommand):
     def __call__(self, pending: bool, page: int, limit: int, public: bool, **kwargs):
         offset = get_offset(page, limit)
         url = "/monitors/public" if public else "/monitors"
-        monitors = client.get(url, params={"limit": limit, "offset": offset}).json()
+        res = client.get(url, params={"limit": limit, "offset": offset})
 
         if not kwargs["json"]:
             # Only get pending monitors when is not a json output and on first page
@@ -39,11 +39,11 @@ class MonitorsCommand(BaseCommand):
                     console.rule("[b red]Pending actions", style="red")
                     autotable(pending_monitors["rows"], "b red", widths=(50, 50))
             console.rule("[b blue]Monitors", style="blue")
-            table = BootstrapTable(**monitors)
+            table = decode_table(res)
             width = (6, 5, 30, 5, 5, 5)
             if public:
                 autotable(table, page=page, limit=limit, widths=width)
             else:
                 group_table(table, "team", "Private", page, limit, widths=width)
         else:
-            autoformat(monitors, jsonfmt=kwargs["json"], list_separator="-" * 48)
+            autoformat(res.json(), jsonfmt=kwargs["json"], list_separator="-" * 48)
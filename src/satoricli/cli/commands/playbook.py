@@ -15,7 +15,7 @@ class PlaybookCommand(BaseCommand):
     name = "playbook"
 
     def register_args(self, parser: ArgumentParser):
-        parser.add_argument("id", metavar="ID")
+        parser.add_argument("id", metavar="ID", nargs="?")
         parser.add_argument(
             "action",
             metavar="ACTION",
@@ -34,10 +34,15 @@ class PlaybookCommand(BaseCommand):
             action="store_true",
             help="Display playbook without formatting",
         )
+        parser.add_argument(
+            "--public",
+            action="store_true",
+            help="List the public playbooks from the local checkout",
+        )
 
     def __call__(
         self,
-        id: str,
+        id: Optional[str],
         action: Literal[
             "show",
             # "delete",
@@ -47,6 +52,14 @@ class PlaybookCommand(BaseCommand):
         original: bool,
         **kwargs,
     ):
+        if not id:
+            if not kwargs["public"]:
+                error_console.print("ERROR: ID or --public required")
+                return 1
+
+            display_public_playbooks()
+            return
+
         if id.startswith("satori://"):
             if not SATORI_URI_REGEX.match(id):
                 raise Exception("ERROR: URI not valid")
@@ -1,12 +1,13 @@
 import shutil
 import sys
-from argparse import ArgumentParser
+from argparse import SUPPRESS, ArgumentParser
 from typing import Optional
 
 from satoricli.api import client
 from satoricli.cli.utils import autoformat, autotable
+from satoricli.models import BootstrapTable
 
-from ..utils import BootstrapTable, console, get_offset
+from ..utils import console, get_offset
 from .base import BaseCommand
 
 
@@ -93,6 +94,27 @@ class PlaybooksCommand(BaseCommand):
             'dast': (uri_width, name_width, max_params_length, image_width_dast)
         }
 
+    @staticmethod
+    def search(query: str, jsonfmt: bool):
+        """Search the index of the public playbooks checkout, no API calls"""
+
+        from satoricli.playbooks import search_playbooks, sync
+
+        if (index := sync()) is None:
+            return 1
+
+        playbooks = search_playbooks(index, query)
+
+        if jsonfmt:
+            autoformat(playbooks, jsonfmt=jsonfmt, list_separator="-" * 48)
+        elif not playbooks:
+            console.print("No playbooks found")
+            return 1
+        else:
+            autotable(playbooks)
+
+        return 0
+
     def register_args(self, parser: ArgumentParser):
         parser.add_argument(
             "-p",
@@ -115,9 +137,32 @@ class PlaybooksCommand(BaseCommand):
         )
         parser.add_argument("--monitor", help="A bool value")
 
+        subparser = parser.add_subparsers(dest="action")
+
+        search_parser = subparser.add_parser(
+            "search", help="Search the public playbooks locally"
+        )
+        search_parser.add_argument(
+            "term", metavar="TERM", nargs="+", help="Name, command or parameter"
+        )
+        # SUPPRESS keeps a -j given before "search"
+        search_parser.add_argument(
+            "-j", "--json", action="store_true", default=SUPPRESS, help="JSON output"
+        )
+
     def __call__(
-        self, page: int, limit: int, public: bool, monitor: Optional[str], **kwargs
+        self,
+        page: int,
+        limit: int,
+        public: bool,
+        monitor: Optional[str],
+        action: Optional[str] = None,
+        term: Optional[list[str]] = None,
+        **kwargs,
     ):
+        if action == "search":
+            return self.search(" ".join(term or ()), kwargs["json"])
+
         offset = get_offset(page, limit)
         params: dict = {"offset": offset, "limit": limit}
         if public:
@@ -4,11 +4,13 @@ from pathlib import Path
 from typing import Literal, Optional, get_args
 
 import httpx
+from msgspec import UNSET
 
 from satoricli.api import client
+from satoricli.models import BootstrapTable, ReportResult
+from satoricli.report_cache import get_report
 
 from ..utils import (
-    BootstrapTable,
     autoformat,
     autotable,
     console,
@@ -246,7 +248,7 @@ class RepoCommand(BaseCommand):
                         completed.append(repo)
 
                     try:
-                        report_data = client.get(f"/reports/{report}").json()
+                        report_data = get_report(report, type=ReportResult)
                     except httpx.HTTPStatusError as e:
                         code = e.response.status_code
                         if code not in (404, 403):
@@ -256,10 +258,10 @@ class RepoCommand(BaseCommand):
                             return 1
 
                     else:
-                        report_status = report_data.get("status", "Unknown")
+                        report_status = report_data.status or "Unknown"
                         if report_status in ("Completed", "Undefined"):
-                            fails = report_data["fails"]
-                            if fails is None:
+                            fails = report_data.fails
+                            if fails in (None, UNSET):
                                 result = "[yellow]Unknown"
                             else:
                                 result = (
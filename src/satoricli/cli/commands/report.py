@@ -20,6 +20,14 @@ from satoricli.cli.utils import (
     get_command_params,
     print_output,
     wait,
+    write_json,
+)
+from satoricli.models import ReportResult
+from satoricli.report_cache import (
+    get_report,
+    get_report_raw,
+    invalidate,
+    set_status,
 )
 
 from .base import BaseCommand
@@ -91,13 +99,14 @@ class ReportCommand(BaseCommand):
                     f"/reports/{id}/team",
                     params={"team_name": kwargs["team"]},
                 ).json()
-            res = client.get(f"/reports/{id}", params={"unredacted": unredacted}).json()
+                invalidate(id)
             if kwargs["json"]:
-                autoformat(res, jsonfmt=kwargs["json"])
+                write_json(get_report_raw(id, unredacted))
             else:
-                ReportCommand.print_report_single(res)
+                ReportCommand.print_report_single(get_report(id, unredacted))
         elif action == "output":
             status = client.get(f"/reports/{id}/status").text
+            set_status(id, status)
 
             if status == "Running":
                 wait(id, True)
@@ -110,6 +119,7 @@ class ReportCommand(BaseCommand):
             autoformat(res, jsonfmt=kwargs["json"])
         elif action == "delete":
             client.delete(f"/reports/{id}")
+            invalidate(id)
             console.print("Report deleted")
         elif action == "visibility":
             if not action2 or action2 not in VISIBILITY_VALUES:
@@ -121,6 +131,7 @@ class ReportCommand(BaseCommand):
                 f"/reports/{id}",
                 json={"visibility": action2.upper()},
             ).json()
+            invalidate(id)
             autoformat(res)
         elif action == "status":
             res = client.get(f"/reports/{id}/status").text
@@ -130,6 +141,7 @@ class ReportCommand(BaseCommand):
                 f"/reports/{id}/team",
                 params={"team_name": action2},
             ).json()
+            invalidate(id)
             autoformat(res)
         elif action == "issue":
             if not action2:
@@ -367,8 +379,8 @@ class ReportCommand(BaseCommand):
             Print as json?
         """
         # Fetch the report data
-        report_data = client.get(f"/reports/{report_id}").json()
-        json_data = report_data.get("report")
+        report_data = get_report(report_id, type=ReportResult)
+        json_data = report_data.report
         if json_data:
             if json_out:  # Print as json if --json is defined
                 console.print_json(data=json_data)
@@ -377,18 +389,18 @@ class ReportCommand(BaseCommand):
                     show_header=False, show_lines=True, highlight=True, expand=False
                 )
                 add_table_row(
-                    [["Result", report_data["result"]]],
+                    [["Result", report_data.result]],
                     table,
                 )
 
                 # Add the parameters if they exist
-                params = get_command_params(report_data["run_params"])
+                params = get_command_params(report_data.run_params)
                 if params:
                     add_table_row([["Parameters", params]], table)
 
-                ReportCommand.print_report_summary(report_data["report"], table)
+                ReportCommand.print_report_summary(json_data, table)
                 console.print(table)
-        elif report_data["status"] == "Timeout":
+        elif report_data.status == "Timeout":
             console.print("[error]Report timed out")
         else:
             console.print("[error]Report not found")
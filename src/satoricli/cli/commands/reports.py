@@ -1,14 +1,17 @@
 """Download, search and delete reports from the server."""
 
+import contextlib
 import datetime
 import json
 import tarfile
+import threading
 import time
 from argparse import ArgumentParser
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from math import ceil
 from pathlib import Path
-from typing import Any, Literal, Optional, Union, get_args
+from typing import Any, BinaryIO, Literal, Optional, Union, get_args
 from urllib.parse import urlencode
 
 import httpx
@@ -20,13 +23,24 @@ from websockets.exceptions import ConnectionClosed, InvalidStatus
 from websockets.sync.client import ClientConnection, connect
 
 from satoricli.api import WS_HOST, client, ssl_ctx
+from satoricli.cache import atomic_write
 from satoricli.cli.utils import (
     autoformat,
     autotable,
     console,
     date_formatter,
+    error_console,
     execution_time,
     get_command_params,
+    print_text,
+)
+from satoricli.download import DownloadError, download_file
+from satoricli.models import SearchCursor, SearchPage
+from satoricli.pack import PackedReport, PackReader, PackWriter
+from satoricli.report_cache import (
+    clear,
+    get_search_cursors,
+    store_search_cursors,
 )
 
 from .base import BaseCommand
@@ -43,6 +57,7 @@ STATUS_FILTERS = Literal[
     "timeout",
 ]
 EXECUTION_FILTERS = Literal["local", "run", "ci", "scan", "monitor"]
+DOWNLOAD_LAYOUT = Literal["files", "pack"]
 
 
 class ReportOutputDownloadData(Struct):
@@ -112,6 +127,9 @@ class ReportExportError(Exception):
 
 
 DOWNLOAD_RECONNECT_ATTEMPTS = 5
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_MANIFEST = ".satori-download.jsonl"
+BLOCK_SIZE = 1024 * 1024  # 1MB
 DEFAULT_EXPORT_ARCHIVE = "reports-export.tar.gz"
 DEFAULT_EXPORT_DIR = "export"
 EXPORT_POLL_INTERVAL_SECONDS = 3.0
@@ -156,30 +174,239 @@ def _decode_download_frame(
     raise ValueError(f"Unknown download frame keys: {sorted(payload)}")
 
 
-def _existing_report_ids(extract_root: Path) -> set[str]:
-    outputs_dir = extract_root / "outputs"
-    if not outputs_dir.is_dir():
-        return set()
-    return {path.stem for path in outputs_dir.glob("*.txt")}
+def _existing_steps(extract_root: Path) -> dict[str, set[str]]:
+    """Steps of the reports already saved in extract_root, by their artifacts"""
+
+    steps: dict[str, set[str]] = {}
+    for step, directory in (("output", "outputs"), ("report", "reports")):
+        for path in (extract_root / directory).glob("*.txt"):
+            steps.setdefault(path.stem, set()).add(step)
+    for report_id, report_steps in steps.items():
+        if (extract_root / report_id).is_dir():
+            report_steps.add("files")
+    return steps
+
+
+class DownloadManifest:
+    """Append-only log of what was saved of every report in a download.
+
+    Each line records one step of a report: its output, its report or its
+    files (downloaded and extracted, or nothing to download). A report is
+    complete once the three steps are logged, resuming redoes only the steps
+    that are missing. A line cut by a crash is ignored, the log is rewritten
+    with a line per step when loaded with repeated or broken lines.
+    """
+
+    STEPS = frozenset({"output", "report", "files"})
+
+    def __init__(self, extract_root: Path):
+        self.path = extract_root / DOWNLOAD_MANIFEST
+        self.steps: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            # Directories downloaded before the manifest existed
+            self.steps = _existing_steps(extract_root)
+            compact = bool(self.steps)
+        else:
+            lines = data.splitlines()
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                    self.steps.setdefault(entry["id"], set()).add(entry["step"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+            recorded = sum(len(steps) for steps in self.steps.values())
+            cut = bool(data) and not data.endswith(b"\n")
+            compact = cut or len(lines) != recorded
+
+        if compact:
+            atomic_write(
+                self.path,
+                "".join(
+                    json.dumps({"id": report_id, "step": step}) + "\n"
+                    for report_id, steps in self.steps.items()
+                    for step in sorted(steps)
+                ).encode(),
+            )
+
+        self._file = self.path.open("a")
+
+    def missing(self, report_id: str) -> frozenset[str]:
+        return self.STEPS - self.steps.get(report_id, set())
+
+    def complete_ids(self) -> set[str]:
+        return {id_ for id_, steps in self.steps.items() if steps >= self.STEPS}
+
+    def record(self, report_id: str, step: str) -> None:
+        with self._lock:
+            self._file.write(json.dumps({"id": report_id, "step": step}) + "\n")
+            self._file.flush()
+            self.steps.setdefault(report_id, set()).add(step)
+
+    def close(self) -> None:
+        self._file.close()
 
 
 def _save_report(
     report_data: ReportOutputDownloadData,
     extract_root: Path,
+    manifest: DownloadManifest,
+    missing: frozenset[str],
+    pack: PackWriter | None = None,
 ) -> None:
-    output_path = extract_root / "outputs" / f"{report_data.report_id}.txt"
-    with output_path.open("w") as f:
-        f.write(report_data.output)
-    report_path = extract_root / "reports" / f"{report_data.report_id}.txt"
-    with report_path.open("wb") as f:
-        f.write(report_data.report)
-    if report_data.files_url:
-        files_path = extract_root / "files" / f"{report_data.report_id}.tar.gz"
-        with httpx.stream("GET", report_data.files_url) as response:
+    report_id = report_data.report_id
+    if pack is not None:
+        if missing & {"output", "report"}:
+            pack.append(
+                PackedReport(report_id, report_data.output, report_data.report)
+            )
+            manifest.record(report_id, "output")
+            manifest.record(report_id, "report")
+    else:
+        if "output" in missing:
+            output_path = extract_root / "outputs" / f"{report_id}.txt"
+            with output_path.open("w") as f:
+                f.write(report_data.output)
+            manifest.record(report_id, "output")
+        if "report" in missing:
+            report_path = extract_root / "reports" / f"{report_id}.txt"
+            with report_path.open("wb") as f:
+                f.write(report_data.report)
+            manifest.record(report_id, "report")
+    if "files" in missing and not report_data.files_url:
+        manifest.record(report_id, "files")
+
+
+class _ResponseReader:
+    """Minimal file object over the body of a streamed response, so tarfile
+    can read it in stream mode. Every chunk read is also written to copy_to."""
+
+    def __init__(self, response: httpx.Response, copy_to: BinaryIO | None = None):
+        self._chunks = response.iter_bytes()
+        self._buffer = b""
+        self._copy_to = copy_to
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            if self._copy_to is not None:
+                self._copy_to.write(chunk)
+            self._buffer += chunk
+
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class ReportFilesDownloader:
+    """Download and extract the files of the reports on a pool of threads.
+
+    The websocket loop only queues the downloads, so frames keep being read
+    while the archives are transferred. Each archive is extracted into
+    extract_root/<report id> as it arrives, it is only written to
+    files/<report id>.tar.gz too when keep_archives is set, or instead when
+    extract is off. Submits never block, the queue only holds report ids and
+    URLs and the workers bound how many transfers run at once. The first
+    failed download is raised on the next submit or on close, on_done is
+    called with the report id of every one that succeeds.
+    """
+
+    def __init__(
+        self,
+        extract_root: Path,
+        workers: int = DOWNLOAD_WORKERS,
+        keep_archives: bool = False,
+        on_done: Callable[[str], None] | None = None,
+        extract: bool = True,
+    ):
+        self.extract_root = extract_root
+        self.keep_archives = keep_archives
+        self.extract = extract
+        self.on_done = on_done
+        self.http = httpx.Client(
+            verify=ssl_ctx,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=workers),
+        )
+        self._executor = ThreadPoolExecutor(workers)
+        self._pending: set[Future[None]] = set()
+        self._failed: BaseException | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, report_id: str, url: str) -> None:
+        self._raise_failed()
+        future = self._executor.submit(self._download, report_id, url)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future[None]) -> None:
+        with self._lock:
+            self._pending.discard(future)
+            if self._failed is None and not future.cancelled():
+                self._failed = future.exception()
+
+    def _download(self, report_id: str, url: str) -> None:
+        if not self.extract:
+            files_path = self.extract_root / "files" / f"{report_id}.tar.gz"
+            with self.http.stream("GET", url) as response:
+                response.raise_for_status()
+                with files_path.open("wb") as f:
+                    for chunk in response.iter_bytes():
+                        f.write(chunk)
+        else:
+            self._extract(report_id, url)
+
+        if self.on_done is not None:
+            self.on_done(report_id)
+
+    def _extract(self, report_id: str, url: str) -> None:
+        output_folder = self.extract_root / report_id
+        output_folder.mkdir(parents=True, exist_ok=True)
+
+        with contextlib.ExitStack() as stack:
+            archive = None
+            if self.keep_archives:
+                files_path = self.extract_root / "files" / f"{report_id}.tar.gz"
+                archive = stack.enter_context(files_path.open("wb"))
+
+            response = stack.enter_context(self.http.stream("GET", url))
             response.raise_for_status()
-            with files_path.open("wb") as f:
-                for chunk in response.iter_bytes():
-                    f.write(chunk)
+            reader = _ResponseReader(response, archive)
+            with tarfile.open(fileobj=reader, mode="r|gz") as tar:  # type: ignore[arg-type]
+                tar.extractall(path=output_folder, filter="data")
+            # Drain what is left after the end of the tar, for the archive copy
+            while reader.read(BLOCK_SIZE):
+                pass
+
+    def _raise_failed(self) -> None:
+        if self._failed is not None:
+            raise self._failed
+
+    def close(self) -> None:
+        """Wait for the queued downloads"""
+
+        try:
+            with self._lock:
+                pending = list(self._pending)
+            for future in as_completed(pending):
+                future.result()
+            self._raise_failed()
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+            self.http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 def _extract_downloaded_files(extract_root: Path) -> None:
@@ -198,6 +425,9 @@ def _run_report_download(
     extract_root: Path,
     filters: dict[str, Any],
     *,
+    workers: int = DOWNLOAD_WORKERS,
+    keep_archives: bool = False,
+    layout: DOWNLOAD_LAYOUT = "files",
     on_progress: Callable[[str], None] | None = None,
 ) -> int:
     def update_status(message: str) -> None:
@@ -205,76 +435,94 @@ def _run_report_download(
             on_progress(message)
 
     filters_json = json.dumps(filters)
-    saved_ids = _existing_report_ids(extract_root)
+    manifest = DownloadManifest(extract_root)
+    saved_ids = manifest.complete_ids()
     last_received_report_id: str | None = None
     session_downloaded = 0
     done_frame: ReportDownloadDoneData | None = None
     ws_ssl = ssl_ctx if WS_HOST.startswith("wss://") else None
     headers = _download_ws_headers()
 
-    for attempt in range(DOWNLOAD_RECONNECT_ATTEMPTS):
-        query = _download_ws_query(
-            filters_json,
-            after_id=last_received_report_id,
-        )
-        disconnect_reason: str | None = None
-        try:
-            with connect(
-                f"{WS_HOST}/reports/download/ws?{query}",
-                ssl=ws_ssl,
-                additional_headers=headers,
-                max_size=1024 * 1024 * 16,  # 16MB
-            ) as websocket:
-                for msg in websocket:
-                    frame = _decode_download_frame(msg)
-                    if isinstance(frame, ReportDownloadDoneData):
-                        done_frame = frame
-                        break
-                    for report_data in frame.reports:
-                        last_received_report_id = report_data.report_id
-                        if report_data.report_id in saved_ids:
-                            continue
-                        _save_report(report_data, extract_root)
-                        saved_ids.add(report_data.report_id)
-                        session_downloaded += 1
-                    update_status(f"Downloaded {len(saved_ids)} reports")
-        except InvalidStatus as exc:
-            if exc.response.status_code == 404:
-                console.print(
-                    "[error]Report not found (invalid after_id for resume)[/]"
-                )
-                return 1
-            raise
-        except ConnectionClosed as exc:
-            disconnect_reason = f"{exc.code} {exc.reason or 'no reason'}"
-            update_status(
-                f"Connection closed ({disconnect_reason}), will resume from last report"
+    pack = PackWriter(extract_root) if layout == "pack" else None
+
+    with contextlib.closing(manifest), ReportFilesDownloader(
+        extract_root,
+        workers,
+        keep_archives,
+        on_done=lambda report_id: manifest.record(report_id, "files"),
+        # The pack layout keeps the files of each report as a single archive
+        extract=pack is None,
+    ) as downloader, pack or contextlib.nullcontext():
+        for attempt in range(DOWNLOAD_RECONNECT_ATTEMPTS):
+            query = _download_ws_query(
+                filters_json,
+                after_id=last_received_report_id,
             )
-        except OSError:
-            disconnect_reason = "network error"
-            update_status("Network error, will resume from last report")
-
-        if done_frame is not None:
-            break
-
-        if attempt < DOWNLOAD_RECONNECT_ATTEMPTS - 1:
-            delay = 2**attempt
-            if disconnect_reason:
-                update_status(
-                    f"Connection lost ({disconnect_reason}), resuming in {delay}s "
-                    f"(attempt {attempt + 2}/{DOWNLOAD_RECONNECT_ATTEMPTS})"
-                )
-            else:
+            disconnect_reason: str | None = None
+            try:
+                with connect(
+                    f"{WS_HOST}/reports/download/ws?{query}",
+                    ssl=ws_ssl,
+                    additional_headers=headers,
+                    max_size=1024 * 1024 * 16,  # 16MB
+                ) as websocket:
+                    for msg in websocket:
+                        frame = _decode_download_frame(msg)
+                        if isinstance(frame, ReportDownloadDoneData):
+                            done_frame = frame
+                            break
+                        for report_data in frame.reports:
+                            last_received_report_id = report_data.report_id
+                            missing = manifest.missing(report_data.report_id)
+                            if not missing:
+                                continue
+                            _save_report(
+                                report_data, extract_root, manifest, missing, pack
+                            )
+                            if "files" in missing and report_data.files_url:
+                                downloader.submit(
+                                    report_data.report_id, report_data.files_url
+                                )
+                            saved_ids.add(report_data.report_id)
+                            session_downloaded += 1
+                        update_status(f"Downloaded {len(saved_ids)} reports")
+            except InvalidStatus as exc:
+                if exc.response.status_code == 404:
+                    console.print(
+                        "[error]Report not found (invalid after_id for resume)[/]"
+                    )
+                    return 1
+                raise
+            except ConnectionClosed as exc:
+                disconnect_reason = f"{exc.code} {exc.reason or 'no reason'}"
                 update_status(
-                    f"Connection lost, resuming in {delay}s "
-                    f"(attempt {attempt + 2}/{DOWNLOAD_RECONNECT_ATTEMPTS})"
+                    f"Connection closed ({disconnect_reason}), will resume from last report"
                 )
-            time.sleep(delay)
-    else:
-        console.print(
-            "[error]Download interrupted: connection closed before export completed[/]"
-        )
-        return 1
+            except OSError:
+                disconnect_reason = "network error"
+                update_status("Network error, will resume from last report")
+
+            if done_frame is not None:
+                break
+
+            if attempt < DOWNLOAD_RECONNECT_ATTEMPTS - 1:
+                delay = 2**attempt
+                if disconnect_reason:
+                    update_status(
+                        f"Connection lost ({disconnect_reason}), resuming in {delay}s "
+                        f"(attempt {attempt + 2}/{DOWNLOAD_RECONNECT_ATTEMPTS})"
+                    )
+                else:
+                    update_status(
+                        f"Connection lost, resuming in {delay}s "
+                        f"(attempt {attempt + 2}/{DOWNLOAD_RECONNECT_ATTEMPTS})"
+                    )
+                time.sleep(delay)
+        else:
+            console.print(
+                "[error]Download interrupted: connection closed before export completed[/]"
+            )
+            return 1
 
     if not done_frame.done:
         message = done_frame.error or "Export failed"
@@ -295,8 +543,6 @@ def _run_report_download(
         console.print("No reports found")
         return 0
 
-    update_status("Extracting files...")
-    _extract_downloaded_files(extract_root)
     if session_downloaded:
         console.print(
             f"Downloaded {session_downloaded} new report(s) ({len(saved_ids)} total)"
@@ -518,12 +764,18 @@ def _describe_export_status(status: ReportExportStatusData) -> str:
     return f"Export status: {status.status}"
 
 
-def _download_export_archive(url: str, output_path: Path) -> None:
-    with httpx.stream("GET", url) as response:
-        response.raise_for_status()
-        with output_path.open("wb") as f:
-            for chunk in response.iter_bytes():
-                f.write(chunk)
+def _download_export_archive(
+    download_data: ReportExportDownloadData,
+    output_path: Path,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> None:
+    download_file(
+        download_data.url,
+        output_path,
+        download_data.size,
+        key=str(download_data.created),
+        on_progress=on_progress,
+    )
 
 
 def _extract_export_archive(archive_path: Path, extract_root: Path) -> None:
@@ -651,17 +903,23 @@ def _run_report_export(output_path: Path) -> int:
             with console.status("Downloading export...", spinner="dots12") as progress:
                 progress.update("Requesting download URL...")
                 download_data = export_client.download_export()
-                progress.update(
-                    f"Downloading {_format_file_size(download_data.size)} archive..."
+                total_size = _format_file_size(download_data.size)
+                progress.update(f"Downloading {total_size} archive...")
+                _download_export_archive(
+                    download_data,
+                    output_path,
+                    on_progress=lambda received, size: progress.update(
+                        f"Downloading archive... "
+                        f"{_format_file_size(received)} of {total_size}"
+                    ),
                 )
-                _download_export_archive(download_data.url, output_path)
                 progress.update("Extracting archive...")
                 _extract_export_archive(output_path, extract_root)
             break
     except ReportExportError as exc:
         console.print(f"[error]{exc}[/]")
         return 1
-    except httpx.HTTPError as exc:
+    except (httpx.HTTPError, DownloadError) as exc:
         console.print(f"[error]Failed to download export archive: {exc}[/]")
         return 1
     finally:
@@ -672,6 +930,15 @@ def _run_report_export(output_path: Path) -> int:
     return 0
 
 
+def search_cursors_key(
+    filters: dict[str, Any], page_size: int, cursor: Optional[str]
+) -> str:
+    """Identify a search in the cursor cache, pages of another size or
+    starting point have other cursors"""
+
+    return json.dumps([filters, page_size, cursor], sort_keys=True, default=str)
+
+
 def advance_search_cursor(
     params: dict[str, Any],
     filters: dict[str, Any],
@@ -679,18 +946,37 @@ def advance_search_cursor(
     pages_to_skip: int,
     page_size: int,
 ) -> bool:
-    """Advance cursor-based search by skipping full pages. Returns False if results end early."""
-    for _ in range(pages_to_skip):
-        params["filters"] = json.dumps(filters)
-        res = client.get("/reports/search", params=params).json()
-        if not res["last_id"]:
-            return False
-        params["cursor"] = res.get("last_id")
+    """Advance cursor-based search by skipping full pages. Returns False if results end early.
+
+    The walk starts from the closest page before the target whose cursor was
+    cached by a recent search, the cursors found on the way are cached too.
+    """
+    search = search_cursors_key(filters, page_size, params.get("cursor"))
+    cursors = get_search_cursors(search)
+    target = pages_to_skip + 1
+    page = max((p for p in cursors if p <= target), default=1)
+    if page > 1:
+        params["cursor"] = cursors[page]
+
+    found: dict[int, str] = {}
+    try:
+        while page < target:
+            params["filters"] = json.dumps(filters)
+            res = client.get("/reports/search", params=params)
+            last_id = msgspec.json.decode(res.content, type=SearchCursor).last_id
+            if not last_id:
+                return False
+            page += 1
+            params["cursor"] = found[page] = last_id
+    finally:
+        if found:
+            store_search_cursors(search, found)
     return True
 
 
-def add_search_args(parser: ArgumentParser) -> None:
-    parser.add_argument("-n", "--name", help="Export folder name")
+def add_filter_args(parser: ArgumentParser) -> None:
+    """Filters of a reports search, also applied by reports query"""
+
     parser.add_argument(
         "--playbook-type",
         choices=get_args(PLAYBOOK_TYPE),
@@ -715,7 +1001,6 @@ def add_search_args(parser: ArgumentParser) -> None:
     )
     parser.add_argument("--monitor", type=str, help="Filter by monitor ID")
     parser.add_argument("--playbook", type=str, help="Filter by playbook")
-    parser.add_argument("--force", action="store_true", help="Force delete")
     parser.add_argument(
         "--status", choices=get_args(STATUS_FILTERS), help="Filter by status"
     )
@@ -745,11 +1030,6 @@ def add_search_args(parser: ArgumentParser) -> None:
         type=str,
         help="Filter by execution ID",
     )
-    parser.add_argument(
-        "--from-report",
-        type=str,
-        help="Report ID to start search from",
-    )
     parser.add_argument(
         "--repo",
         type=str,
@@ -763,6 +1043,17 @@ def add_search_args(parser: ArgumentParser) -> None:
     )
 
 
+def add_search_args(parser: ArgumentParser) -> None:
+    parser.add_argument("-n", "--name", help="Export folder name")
+    add_filter_args(parser)
+    parser.add_argument("--force", action="store_true", help="Force delete")
+    parser.add_argument(
+        "--from-report",
+        type=str,
+        help="Report ID to start search from",
+    )
+
+
 class ReportsCommand(BaseCommand):
     name = "reports"
 
@@ -782,12 +1073,48 @@ class ReportsCommand(BaseCommand):
 
         download_parser = subparser.add_parser("download")
         add_search_args(download_parser)
+        download_parser.add_argument(
+            "--jobs",
+            type=int,
+            default=DOWNLOAD_WORKERS,
+            help="Number of report files downloaded at the same time",
+        )
+        download_parser.add_argument(
+            "--keep-archives",
+            action="store_true",
+            help="Also keep the files of each report as files/<report id>.tar.gz",
+        )
+        download_parser.add_argument(
+            "--layout",
+            choices=get_args(DOWNLOAD_LAYOUT),
+            default="files",
+            help=(
+                "Save a file per report, or append them to pack segment files."
+                " With pack, the files of a report are kept unextracted as"
+                " files/<report id>.tar.gz"
+            ),
+        )
+
+        open_parser = subparser.add_parser("open")
+        open_parser.add_argument("path", type=Path, help="Downloaded reports folder")
+        open_parser.add_argument(
+            "report_id", nargs="?", help="Report to print, all are listed if missing"
+        )
+        open_parser.add_argument(
+            "--report",
+            action="store_true",
+            help="Print the report instead of the output",
+        )
 
         stop_parser = subparser.add_parser("stop")
         add_search_args(stop_parser)
 
         subparser.add_parser("export")
 
+        query_parser = subparser.add_parser("query")
+        query_parser.add_argument("path", type=Path, help="Downloaded reports folder")
+        add_filter_args(query_parser)
+
     def __call__(
         self,
         action: Optional[str],
@@ -812,6 +1139,9 @@ class ReportsCommand(BaseCommand):
         repo: Optional[str] = None,
         regex: bool = False,
         case_sensitive: bool = False,
+        jobs: int = DOWNLOAD_WORKERS,
+        keep_archives: bool = False,
+        layout: DOWNLOAD_LAYOUT = "files",
         **kwargs,
     ):
         filters: dict[str, Any] = {}
@@ -819,7 +1149,7 @@ class ReportsCommand(BaseCommand):
         if public:
             action = "search"
             visibility = "public-global"
-        if action in ("delete", "search", "download", "stop"):
+        if action in ("delete", "search", "download", "stop", "query"):
             filters = {
                 "playbook_type": _uppercase(playbook_type),
                 "report_visibility": "Public-Global"
@@ -863,6 +1193,7 @@ class ReportsCommand(BaseCommand):
                 autoformat(res["rows"], jsonfmt=kwargs["json"])
         elif action == "search":
             params["cursor"] = from_report
+            search = search_cursors_key(filters, limit, from_report)
             if page > 1 and not advance_search_cursor(
                 params, filters, pages_to_skip=page - 1, page_size=limit
             ):
@@ -889,25 +1220,28 @@ class ReportsCommand(BaseCommand):
 
             with Live(table, console=console, refresh_per_second=1):
                 params["filters"] = json.dumps(filters)
-                res = client.get("/reports/search", params=params).json()
-                for report in res["rows"]:
+                response = client.get("/reports/search", params=params)
+                search_page = msgspec.json.decode(response.content, type=SearchPage)
+                rows = search_page.rows
+                if search_page.last_id:
+                    # The next page costs a single request
+                    store_search_cursors(search, {page + 1: search_page.last_id})
+                for report in rows:
                     table.add_row(
-                        report["id"],
-                        get_command_params(report.get("run_params")),
-                        report.get("playbook_path", report.get("playbook_uri")),
-                        report.get("playbook_name"),
-                        report.get("execution"),
-                        report.get("status"),
-                        report.get("result"),
+                        report.id,
+                        get_command_params(report.run_params),
+                        report.path,
+                        report.playbook_name,
+                        report.execution,
+                        report.status,
+                        report.result,
                         execution_time(
-                            report.get("execution_time", report.get("run_time")),
-                            report.get("date")
-                            if report.get("status") == "Running"
-                            else None,
+                            report.runtime,
+                            report.date if report.status == "Running" else None,
                         ),
-                        date_formatter(report.get("date")),
+                        date_formatter(report.date),
                     )
-            if not res["rows"]:
+            if not rows:
                 console.print("No reports found")
                 return 1
             console.print(f"Page {page}")
@@ -926,7 +1260,8 @@ class ReportsCommand(BaseCommand):
                     f"[warning]Directory already exists: [b]{extract_dir}[/]"
                     "\nRemove it manually to avoid conflicts",
                 )
-            for subdir in ("outputs", "reports", "files"):
+            subdirs = ["outputs", "reports", "files"] if layout == "files" else ["files"]
+            for subdir in subdirs:
                 (extract_root / subdir).mkdir(parents=True, exist_ok=True)
 
             with console.status(
@@ -936,10 +1271,19 @@ class ReportsCommand(BaseCommand):
                 return _run_report_download(
                     extract_root,
                     filters,
+                    workers=max(jobs, 1),
+                    keep_archives=keep_archives,
+                    layout=layout,
                     on_progress=progress.update,
                 )
         elif action == "export":
             return _run_report_export(Path(DEFAULT_EXPORT_ARCHIVE))
+        elif action == "query":
+            return self.query_index(kwargs["path"], filters, kwargs["json"])
+        elif action == "open":
+            return self.open_pack(
+                kwargs["path"], kwargs["report_id"], kwargs["report"]
+            )
         elif action == "delete":
             console.print(
                 "[warning]This action will delete all reports that match the criteria[/]"
@@ -973,6 +1317,7 @@ class ReportsCommand(BaseCommand):
                         return 0
                 console.print("Deleting reports...")
                 websocket.send("delete")
+                clear()
                 for msg in websocket:
                     res_decode = json.loads(msg)
                     if "error" in res_decode:
@@ -1013,6 +1358,70 @@ class ReportsCommand(BaseCommand):
             return 1
         return 0
 
+    @staticmethod
+    def query_index(path: Path, filters: dict[str, Any], print_json: bool) -> int:
+        """Search a downloaded reports folder without going to the API"""
+
+        from satoricli.report_index import ReportIndex
+
+        if not path.is_dir():
+            console.print(f"[error]Folder not found: {path}[/]")
+            return 1
+
+        with console.status("Indexing reports...", spinner="dots12"):
+            index = ReportIndex(path)
+        try:
+            rows = index.search(filters)
+        finally:
+            index.close()
+
+        if print_json:
+            autoformat(rows, jsonfmt=True)
+            return 0
+        if not rows:
+            console.print("No reports found")
+            return 1
+
+        autotable(
+            [
+                {
+                    "id": row["id"],
+                    "playbook_path": row["playbook_path"],
+                    "playbook_name": row["playbook_name"],
+                    "execution": row["execution"],
+                    "status": row["status"],
+                    "result": row["result"],
+                    "date": date_formatter(row["date"]),
+                }
+                for row in rows
+            ],
+            widths=(16,),
+        )
+        # Like the page footer of autotable, kept out of piped rows
+        out = console if console.is_terminal else error_console
+        out.print(f"Total: {len(rows)}")
+        return 0
+
+    @staticmethod
+    def open_pack(path: Path, report_id: Optional[str], report: bool) -> int:
+        """List the reports of a pack or print one of them"""
+
+        if not PackReader.exists(path):
+            console.print(f"[error]No report pack found in {path}[/]")
+            return 1
+
+        pack = PackReader(path)
+        if report_id is None:
+            print_text("\n".join(pack.ids()))
+            return 0
+
+        if not (packed := pack.get(report_id)):
+            console.print(f"[error]Report {report_id} not found in {path}[/]")
+            return 1
+
+        print_text(packed.report.decode(errors="replace") if report else packed.output)
+        return 0
+
     @staticmethod
     def print_table(reports: list) -> None:
         autotable(
@@ -4,10 +4,10 @@ from typing import Literal, Optional
 from satoricli.api import client
 
 from ..utils import (
-    BootstrapTable,
     autoformat,
     autotable,
     console,
+    decode_table,
     error_console,
     get_offset,
     group_table,
@@ -52,7 +52,7 @@ class ReposCommand(BaseCommand):
         offset = get_offset(page, limit)
         if action == "show":
             url = "/repos/public" if public else "/repos"
-            repos = client.get(url, params={"offset": offset, "limit": limit}).json()
+            res = client.get(url, params={"offset": offset, "limit": limit})
 
             if not kwargs["json"]:
                 # Only get pending repos when is not a json output and on first page
@@ -62,14 +62,12 @@ class ReposCommand(BaseCommand):
                         console.rule("[b red]Pending actions", style="red")
                         autotable(pending_repos["rows"], "bold red", widths=(50, 50))
                 if public:
-                    autotable(BootstrapTable(**repos), page=page, limit=limit)
+                    autotable(decode_table(res), page=page, limit=limit)
                 else:
                     # Group repos by team name
-                    group_table(
-                        BootstrapTable(**repos), "teams", "Private", page, limit
-                    )
+                    group_table(decode_table(res), "teams", "Private", page, limit)
             else:
-                autoformat(repos, jsonfmt=kwargs["json"], list_separator="-" * 48)
+                autoformat(res.json(), jsonfmt=kwargs["json"], list_separator="-" * 48)
         else:  # playbook
             if action2 == "list":
                 data = client.get(
@@ -14,70 +14,45 @@ from ..arguments import (
     team_arg,
     verbose_arg,
 )
-from .ai import AiCommand
-from .base import BaseCommand
-from .config import ConfigCommand
-from .dashboard import DashboardCommand
-from .feedback import FeedbackCommand
-from .help import HelpCommand
-from .install import InstallCommand
-from .local import LocalCommand
-from .monitor import MonitorCommand
-from .monitors import MonitorsCommand
-from .playbook import PlaybookCommand
-from .playbooks import PlaybooksCommand
-from .repo import RepoCommand
-from .report import ReportCommand
-from .reports import ReportsCommand
-from .repos import ReposCommand
-from .run import RunCommand
-from .scan import ScanCommand
-from .scans import ScansCommand
-from .settings import SettingsCommand
-from .shards import ShardsCommand
-from .shell import ShellCommand, ShellsCommand
-from .team import TeamCommand
-from .teams import TeamsCommand
-from .template import TemplateCommand
-from .templates import TemplatesCommand
-from .update import UpdateCommand
-from .whoami import WhoamiCommand
-from .width import WidthCommand
+from .base import BaseCommand, LazyCommand
 
 VERSION = metadata.version("satori-ci")
 
+dashboard = LazyCommand("dashboard", ".dashboard:DashboardCommand")
+
 
 class RootCommand(BaseCommand):
+    # Command modules are only imported when their command is selected
     subcommands = (
-        ConfigCommand,
-        RunCommand,
-        ReportCommand,
-        ReportsCommand,
-        MonitorCommand,
-        MonitorsCommand,
-        RepoCommand,
-        ReposCommand,
-        ScanCommand,
-        PlaybookCommand,
-        PlaybooksCommand,
-        DashboardCommand,
-        TeamCommand,
-        TeamsCommand,
-        HelpCommand,
-        UpdateCommand,
-        LocalCommand,
-        ScansCommand,
-        ShardsCommand,
-        InstallCommand,
-        WidthCommand,
-        WhoamiCommand,
-        SettingsCommand,
-        TemplateCommand,
-        TemplatesCommand,
-        ShellCommand,
-        ShellsCommand,
-        AiCommand,
-        FeedbackCommand,
+        LazyCommand("config", ".config:ConfigCommand"),
+        LazyCommand("run", ".run:RunCommand"),
+        LazyCommand("report", ".report:ReportCommand"),
+        LazyCommand("reports", ".reports:ReportsCommand"),
+        LazyCommand("monitor", ".monitor:MonitorCommand"),
+        LazyCommand("monitors", ".monitors:MonitorsCommand"),
+        LazyCommand("repo", ".repo:RepoCommand"),
+        LazyCommand("repos", ".repos:ReposCommand"),
+        LazyCommand("scan", ".scan:ScanCommand"),
+        LazyCommand("playbook", ".playbook:PlaybookCommand"),
+        LazyCommand("playbooks", ".playbooks:PlaybooksCommand"),
+        dashboard,
+        LazyCommand("team", ".team:TeamCommand"),
+        LazyCommand("teams", ".teams:TeamsCommand"),
+        LazyCommand("help", ".help:HelpCommand"),
+        LazyCommand("update", ".update:UpdateCommand"),
+        LazyCommand("local", ".local:LocalCommand"),
+        LazyCommand("scans", ".scans:ScansCommand"),
+        LazyCommand("shards", ".shards:ShardsCommand"),
+        LazyCommand("install", ".install:InstallCommand"),
+        LazyCommand("width", ".width:WidthCommand"),
+        LazyCommand("whoami", ".whoami:WhoamiCommand"),
+        LazyCommand("settings", ".settings:SettingsCommand"),
+        LazyCommand("template", ".template:TemplateCommand"),
+        LazyCommand("templates", ".templates:TemplatesCommand"),
+        LazyCommand("shell", ".shell:ShellCommand"),
+        LazyCommand("shells", ".shell:ShellsCommand"),
+        LazyCommand("ai", ".ai:AiCommand"),
+        LazyCommand("feedback", ".feedback:FeedbackCommand"),
     )
     name = "satori"
     global_options = (
@@ -89,7 +64,7 @@ class RootCommand(BaseCommand):
         config_arg,
         verbose_arg,
     )
-    default_subcommand = DashboardCommand
+    default_subcommand = dashboard
 
     def register_args(self, parser: ArgumentParser):
         parser.add_argument(
@@ -173,6 +148,7 @@ class RootCommand(BaseCommand):
         rows = [
             ("satori playbooks", "List your private playbooks"),
             ("satori playbooks --public", "List the public playbooks"),
+            ("satori playbooks search TERM", "Search the public playbooks locally"),
             ("satori playbook ID", "Show a certain playbook"),
             (
                 "satori playbook ID visibility public",
@@ -1,9 +1,7 @@
-import fnmatch
 import json
 import os
 import shutil
 import sys
-import tarfile
 import tempfile
 import time
 import uuid
@@ -13,7 +11,6 @@ from pathlib import Path
 from typing import Any, Literal, Optional, Union, get_args
 
 import httpx
-import yaml
 from rich.progress import open as progress_open
 from satorici.validator import validate_settings
 
@@ -22,6 +19,13 @@ from satoricli.bundler import make_bundle
 from satoricli.cli.commands.run_script import run_script
 from satoricli.cli.commands.scan import ScanCommand
 from satoricli.cli.utils import log
+from satoricli.packet import (
+    DEFAULT_COMPRESS_LEVEL,
+    DeltaPacket,
+    iter_tree,
+    write_packet,
+)
+from satoricli.utils import load_playbook
 from satoricli.validations import get_parameters, validate_parameters
 
 from ..utils import (
@@ -56,64 +60,43 @@ def include_files(include: list[str]) -> Optional[str]:
     return f"{temp_dir}.tar.gz"
 
 
-def read_gitignore_patterns(root: Path) -> list[str]:
-    """Read the gitignore patterns from the root directory."""
-    gitignore = root / ".gitignore"
-    if not gitignore.exists():
-        return []
-    patterns = []
-    for raw in gitignore.read_text(errors="replace").splitlines():
-        line = raw.strip()
-        if line and not line.startswith("#"):
-            patterns.append(line)
-    return patterns
-
-
-def is_gitignored(rel_path: str, patterns: list[str]) -> bool:
-    """Return True if rel_path is ignored, using last-match-wins semantics."""
-    rel = Path(rel_path)
-    name = rel.name
-    # Normalise to forward slashes for pattern matching
-    rel_str = rel_path.replace("\\", "/")
-
-    result = False
-    for pattern in patterns:
-        neg = pattern.startswith("!")
-        pat = pattern.lstrip("!").rstrip("/")
-        stripped = pat.lstrip("/")
-        if "/" in stripped:
-            matched = fnmatch.fnmatch(rel_str, stripped)
-        else:
-            matched = fnmatch.fnmatch(name, pat) or any(
-                fnmatch.fnmatch(part, pat) for part in rel.parts[:-1]
-            )
+def make_packet(
+    path: str, gitignore: bool, compress_level: int = DEFAULT_COMPRESS_LEVEL
+):
+    temp_file = Path(tempfile.gettempdir(), f"{uuid.uuid4()}.tar.gz")
 
-        if matched:
-            result = not neg
+    with temp_file.open("wb") as f:
+        write_packet(iter_tree(Path(path), gitignore), f, compress_level)
 
-    return result
+    return str(temp_file)
 
 
-def make_packet(path: str, gitignore: bool):
-    temp_file = Path(tempfile.gettempdir(), str(uuid.uuid4()))
-    base = Path(path)
+def upload_packet(arc: dict, packet: Union[str, DeltaPacket]) -> None:
+    if isinstance(packet, DeltaPacket):
+        # Only send the changes if the storage holds our last upload
+        path = packet.build(arc)
+    else:
+        path = packet
+
+    try:
+        with progress_open(
+            path, "rb", description="Uploading...", console=error_console
+        ) as f:
+            res = httpx.post(arc["url"], data=arc["fields"], files={"file": f})
+        res.raise_for_status()
+    finally:
+        os.remove(path)
 
-    if not gitignore:
-        shutil.make_archive(str(temp_file), "gztar", path)
-        return f"{temp_file}.tar.gz"
+    if isinstance(packet, DeltaPacket):
+        packet.save()
 
-    patterns = read_gitignore_patterns(base)
 
-    with tarfile.open(f"{temp_file}.tar.gz", "w:gz") as tar:
-        for item in sorted(base.rglob("*")):
-            rel = item.relative_to(base)
-            # Always skip the .git directory
-            if ".git" in rel.parts:
-                continue
-            if not is_gitignored(str(rel), patterns):
-                tar.add(item, arcname=str(rel), recursive=False)
+def delta_fields(packet: Union[str, DeltaPacket, None]) -> dict[str, str]:
+    """Digest of the last upload, only sent with --delta"""
 
-    return f"{temp_file}.tar.gz"
+    if isinstance(packet, DeltaPacket):
+        return {"manifest": packet.base_digest or ""}
+    return {}
 
 
 def new_run(
@@ -122,7 +105,7 @@ def new_run(
     team: str,
     modes: Optional[dict] = None,
     bundle: Optional[Any] = None,
-    packet: Optional[Path] = None,
+    packet: Union[str, DeltaPacket, None] = None,
     secrets: Optional[dict] = None,
     settings: Optional[dict] = None,
     save_report: Union[str, bool, None] = None,
@@ -134,7 +117,8 @@ def new_run(
 ) -> list[str]:
     data = client.post(
         "/runs",
-        data={
+        data=delta_fields(packet)
+        | {
             "path": path,
             "secrets": json.dumps(secrets) if secrets else None,
             "settings": json.dumps(settings) if settings else None,
@@ -159,14 +143,8 @@ def new_run(
                 reports_list = res.get("rows")
                 time.sleep(1)
             return [x["id"] for x in reports_list]
-        try:
-            with progress_open(
-                packet, "rb", description="Uploading...", console=error_console
-            ) as f:
-                res = httpx.post(arc["url"], data=arc["fields"], files={"file": f})
-            res.raise_for_status()
-        finally:
-            os.remove(packet)
+        if packet:
+            upload_packet(arc, packet)
 
     return data["report_ids"]
 
@@ -176,13 +154,14 @@ def new_monitor(
     settings: dict,
     team: str,
     *,
-    packet: Optional[Path] = None,
+    packet: Union[str, DeltaPacket, None] = None,
     secrets: Optional[dict] = None,
     visibility: str,
 ) -> str:
     data = client.post(
         "/monitors",
-        data={
+        data=delta_fields(packet)
+        | {
             "secrets": json.dumps(secrets) if secrets else None,
             "settings": json.dumps(settings),
             "with_files": bool(packet),
@@ -192,22 +171,15 @@ def new_monitor(
         files={"bundle": bundle} if bundle else {"": ""},
     ).json()
 
-    if arc := data["upload_data"]:
-        try:
-            with progress_open(
-                packet, "rb", description="Uploading...", console=error_console
-            ) as f:
-                res = httpx.post(arc["url"], data=arc["fields"], files={"file": f})
-            res.raise_for_status()
-        finally:
-            os.remove(packet)
+    if (arc := data["upload_data"]) and packet:
+        upload_packet(arc, packet)
 
     return data["monitor_id"]
 
 
 def has_files(playbook_path: Path):
     try:
-        return yaml.safe_load(playbook_path.read_text())["settings"]["files"]
+        return load_playbook(playbook_path)["settings"]["files"]
     except Exception:
         return False
 
@@ -238,8 +210,7 @@ def warn_settings(settings: dict):
 
 
 def get_parameters_from_env(playbook_path: str):
-    with open(playbook_path) as f:
-        playbook: dict = yaml.safe_load(f)
+    playbook: dict = load_playbook(playbook_path)
     return {k: [v] for k, v in os.environ.items() if k in get_parameters(playbook)}
 
 
@@ -287,6 +258,19 @@ class RunCommand(BaseCommand):
         sync.add_argument("-f", "--files", action="store_true")
         sync.add_argument("--stdout", action="store_true")
         sync.add_argument("--gitignore", action="store_true")
+        sync.add_argument(
+            "--compress-level",
+            type=int,
+            choices=range(10),
+            default=DEFAULT_COMPRESS_LEVEL,
+            metavar="0-9",
+            help="gzip level used for the uploaded directory",
+        )
+        sync.add_argument(
+            "--delta",
+            action="store_true",
+            help="Upload only the files changed since the last run of PATH",
+        )
         parser.add_argument(
             "--visibility", choices=get_args(VISIBILITY_VALUES), type=str.lower, default=None
         )
@@ -328,6 +312,8 @@ class RunCommand(BaseCommand):
         files: bool,
         stdout: bool,
         gitignore: bool,
+        compress_level: int,
+        delta: bool,
         team: str,
         filter_tests: list,
         text_format: Literal["plain", "md"],
@@ -432,9 +418,9 @@ class RunCommand(BaseCommand):
                 return 1
 
             bundle = make_bundle(file_path, file_path.parent)
-            config = yaml.safe_load(file_path.read_bytes())
+            config = load_playbook(file_path)
 
-            settings: dict[str, Any] = config.get("settings", {})
+            settings: dict[str, Any] = dict(config.get("settings", {}))
             is_monitor = is_monitor or settings.get("cron") or settings.get("rate")
             settings.update(cli_settings)
 
@@ -463,7 +449,11 @@ class RunCommand(BaseCommand):
                 )
         elif (base := Path(path)).is_dir():
             settings = {}
-            packet = make_packet(base, gitignore)
+            packet = (
+                DeltaPacket(base, gitignore, compress_level)
+                if delta
+                else make_packet(base, gitignore, compress_level)
+            )
             bundle = None
             secrets = None
 
@@ -480,9 +470,9 @@ class RunCommand(BaseCommand):
 
                 playbook_path = str(dir_playbook)
 
-                config = yaml.safe_load(dir_playbook.read_bytes())
+                config = load_playbook(dir_playbook)
 
-                settings: dict = config.get("settings", {})
+                settings: dict = dict(config.get("settings", {}))
                 is_monitor = is_monitor or settings.get("cron") or settings.get("rate")
                 settings.update(cli_settings)
 
@@ -497,7 +487,7 @@ class RunCommand(BaseCommand):
                 ):
                     return 1
 
-                if missing_ymls(config, path):
+                if missing_ymls(dir_playbook):
                     log.warning(
                         "There are some .satori.yml outside the root "
                         "folder that have not been imported."
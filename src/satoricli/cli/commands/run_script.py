@@ -5,8 +5,11 @@ from io import BytesIO
 from zipfile import ZipFile
 
 import httpx
+from msgspec import UNSET
 
 from satoricli.api import client
+from satoricli.models import Output
+from satoricli.report_cache import get_outputs
 
 from ..utils import console, error_console, wait
 
@@ -56,8 +59,8 @@ def run_script(
     if show_stdout:
         wait(report_id)
 
-        for output in client.get(f"/outputs/{report_id}").json():
-            stdout = output.get("output", {}).get("stdout")
+        for output in get_outputs(report_id, type=list[Output]):
+            stdout = output.output.stdout
 
-            if stdout is not None:
+            if stdout not in (None, UNSET):
                 console.out(stdout, highlight=False)
@@ -9,7 +9,6 @@ from typing import Literal, Optional, get_args
 from satoricli.api import client
 from satoricli.cli.commands.report import ReportCommand
 from satoricli.cli.utils import (
-    BootstrapTable,
     autoformat,
     autotable,
     console,
@@ -21,6 +20,8 @@ from satoricli.cli.utils import (
     resolve_visibility,
     wait,
 )
+from satoricli.models import BootstrapTable
+from satoricli.report_cache import clear
 
 from ..arguments import date_args
 from .base import BaseCommand
@@ -149,9 +150,11 @@ class ScanCommand(BaseCommand):
             client.delete(
                 f"scan/{repository}/reports", params={"delete_commits": delete_commits}
             )
+            clear()
             info = {"message": "Scan reports cleaned"}
         elif action == "delete":
             client.delete(f"scan/{repository}")
+            clear()
             info = {"message": "Scan deleted"}
         elif action == "stop":
             self.check_scan_id(repository)
@@ -194,6 +197,7 @@ class ScanCommand(BaseCommand):
                 f"/scan/{repository}",
                 json={"visibility": action2.upper()},
             ).json()
+            clear()
         autoformat(info, jsonfmt=kwargs["json"], list_separator="-" * 48)
         return 0
 
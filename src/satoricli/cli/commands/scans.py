@@ -2,7 +2,7 @@ from argparse import ArgumentParser
 
 from satoricli.api import client
 
-from ..utils import BootstrapTable, autoformat, autotable
+from ..utils import autoformat, autotable, decode_table
 from .base import BaseCommand
 
 
@@ -16,10 +16,10 @@ class ScansCommand(BaseCommand):
 
     def __call__(self, page: int, limit: int, public: bool, **kwargs):
         url = "/scan/public" if public else "/scan"
-        scans = client.get(url, params={"page": page, "limit": limit}).json()
+        res = client.get(url, params={"page": page, "limit": limit})
 
         if not kwargs["json"]:
             # Group scans by team name
-            autotable(BootstrapTable(**scans), page=page, limit=limit, widths=(16,))
+            autotable(decode_table(res), page=page, limit=limit, widths=(16,))
         else:
-            autoformat(scans, jsonfmt=kwargs["json"], list_separator="-" * 48)
+            autoformat(res.json(), jsonfmt=kwargs["json"], list_separator="-" * 48)
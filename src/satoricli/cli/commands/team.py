@@ -4,10 +4,10 @@ from typing import Literal, Optional, get_args
 from satoricli.api import client
 from satoricli.cli.utils import (
     VISIBILITY_VALUES,
-    BootstrapTable,
     autoformat,
     autotable,
     console,
+    decode_table,
     error_console,
     get_offset,
 )
@@ -98,11 +98,11 @@ class TeamCommand(BaseCommand):
                 raise Exception("Use --github, --email, --repo or --monitor")
         elif action == "repos":
             offset = get_offset(page, limit)
-            info = client.get(
+            res = client.get(
                 f"/teams/{id}/repos", params={"offset": offset, "limit": limit}
-            ).json()
+            )
             autotable(
-                BootstrapTable(**info), "b blue", False, (20, 20, None), page, limit
+                decode_table(res), "b blue", False, (20, 20, None), page, limit
             )
             return 0
         elif action == "get_config":
@@ -1,7 +1,7 @@
 from argparse import ArgumentParser
 
 from satoricli.api import client
-from satoricli.cli.utils import BootstrapTable, autotable
+from satoricli.cli.utils import autotable, decode_table
 
 from .base import BaseCommand
 
@@ -14,5 +14,5 @@ class TemplatesCommand(BaseCommand):
         parser.add_argument("-l", "--limit", type=int, default=20)
 
     def __call__(self, page: int, limit: int, **kwargs):
-        info = client.get("/templates", params={"page": page, "limit": limit}).json()
-        autotable(BootstrapTable(**info), page=page, limit=limit)
+        res = client.get("/templates", params={"page": page, "limit": limit})
+        autotable(decode_table(res), page=page, limit=limit)
@@ -8,38 +8,43 @@ import re
 import sys
 import time
 import warnings
-from dataclasses import dataclass
-from itertools import zip_longest
+from itertools import islice, zip_longest
 from math import ceil
 from pathlib import Path
-from typing import Any, Iterable, Literal, Optional, Union
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Literal, Optional, Union
 
 import httpx
 import yaml
-from rich import print_json
+from rich.cells import cell_len
 from rich.console import Console
+from rich.control import strip_control_codes
 from rich.highlighter import RegexHighlighter
 from rich.logging import RichHandler
-from rich.markdown import Markdown
 from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
-from rich.syntax import Syntax
 from rich.table import Table
 from rich.theme import Theme
-from satorici.validator import validate_playbook
-from satorici.validator.exceptions import (
-    NoExecutionsError,
-    PlaybookValidationError,
-    PlaybookVariableError,
-)
-from satorici.validator.warnings import MissingAssertionsWarning
 
 from satoricli.api import client
-from satoricli.bundler import get_local_files
-from satoricli.validations import get_parameters, has_executions
+from satoricli.utils import load_playbook
+
+if TYPE_CHECKING:
+    from rich.syntax import Syntax
+
+    from satoricli.models import BootstrapTable, Output
+
+# rich's Markdown and Syntax, msgspec and its models, the report cache, the
+# playbook validator and the bundler are imported where they are used so
+# commands that don't need them start faster
 
 __decorations = "▢•○░"
 __random_colors = ["green", "blue", "red"]
 VISIBILITY_VALUES = ("public", "private", "unlisted")
+JSON_CHUNK_SIZE = 1024 * 1024  # 1MB
+TABLE_SAMPLE_ROWS = 200
+# Every C0 control character but tab and newline, and DEL
+TERMINAL_STRIP_TRANSLATE = dict.fromkeys(
+    [*(c for c in range(32) if c not in (9, 10)), 127]
+)
 
 
 def resolve_visibility(
@@ -50,16 +55,14 @@ def resolve_visibility(
     return (cli_visibility or default_visibility or fallback).lower()
 
 
-@dataclass
-class BootstrapTable:
-    """Based on https://bootstrap-table.com/docs/api/table-options/#url."""
+def decode_table(res: httpx.Response) -> "BootstrapTable":
+    """Decode a paginated response straight from its body"""
+
+    import msgspec
+
+    from satoricli.models import BootstrapTable
 
-    total: int
-    totalNotFiltered: int  # noqa: N815
-    rows: list[dict]
-    last_id: str | None = None
-    last_timestamp: str | None = None
-    finished: bool = False
+    return msgspec.json.decode(res.content, type=BootstrapTable)
 
 
 # Set rich theme and console
@@ -114,8 +117,9 @@ SATORI_STYLES = {
     "satori.yes": "bright_red",
 }
 satori_theme = Theme(SATORI_STYLES)
+# Recording is only enabled by start_export when --export is used
 console = Console(
-    highlighter=SatoriHighlighter(), theme=satori_theme, log_path=False, record=True
+    highlighter=SatoriHighlighter(), theme=satori_theme, log_path=False
 )
 error_console = Console(
     highlighter=SatoriHighlighter(), theme=satori_theme, log_path=False, stderr=True
@@ -130,8 +134,6 @@ def configure_console_width(width: Optional[int] = None):
     """
     import sys
 
-    global console, error_console
-
     if width is not None:
         # Check if we're running in a non-interactive environment (CI, subprocess, etc.)
         is_interactive = sys.stdout.isatty() and sys.stderr.isatty()
@@ -151,20 +153,83 @@ def configure_console_width(width: Optional[int] = None):
                 width = actual_width
         # In non-interactive mode (CI/subprocess), use configured width without validation
 
-        console = Console(
-            highlighter=SatoriHighlighter(),
-            theme=satori_theme,
-            log_path=False,
-            record=True,
-            width=width,
-        )
-        error_console = Console(
-            highlighter=SatoriHighlighter(),
-            theme=satori_theme,
-            log_path=False,
-            stderr=True,
-            width=width,
-        )
+        # Resize in place, command modules hold references to these consoles
+        console.width = width
+        error_console.width = width
+
+
+class ExportWriter:
+    """Write what the console records to output.{format} while the command runs.
+
+    The record buffer is drained on every flush, text and HTML are appended to
+    the file so memory stays bounded. SVG needs the whole screen to compute its
+    size, so it is rendered once on close.
+    """
+
+    def __init__(self, format: Literal["html", "svg", "txt"]):
+        from rich.console import CONSOLE_HTML_FORMAT  # type: ignore[attr-defined]
+        from rich.terminal_theme import DEFAULT_TERMINAL_THEME
+
+        self.format = format
+        self.file = open(f"output.{format}", "w", encoding="utf-8")
+        console.record = True
+
+        header, _, self.footer = CONSOLE_HTML_FORMAT.partition("{code}")
+        if format == "html":
+            self.file.write(
+                header.format(
+                    stylesheet="",
+                    foreground=DEFAULT_TERMINAL_THEME.foreground_color.hex,
+                    background=DEFAULT_TERMINAL_THEME.background_color.hex,
+                )
+            )
+
+    def flush(self) -> None:
+        if self.format == "txt":
+            self.file.write(console.export_text())
+        elif self.format == "html":
+            self.file.write(
+                console.export_html(code_format="{code}", inline_styles=True)
+            )
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.format == "svg":
+            content = console.export_svg(title="satori-cli")
+            # remove non xml utf-8 chars
+            regex = (
+                r"[^\x09\x0A\x0D\x20-\xFF\x85\xA0-\uD7FF\uE000-\uFDCF\uFDE0-\uFFFD]"
+            )
+            self.file.write(re.sub(regex, "", content, flags=re.MULTILINE))
+        else:
+            self.flush()
+            if self.format == "html":
+                self.file.write(self.footer)
+
+        self.file.close()
+        console.record = False
+
+
+exporter: Optional[ExportWriter] = None
+
+
+def start_export(format: Literal["html", "svg", "txt"]) -> None:
+    global exporter
+    exporter = ExportWriter(format)
+
+
+def flush_export() -> None:
+    """Hand what was recorded so far to the export file, if any"""
+
+    if exporter and exporter.format != "svg":
+        exporter.flush()
+
+
+def close_export() -> None:
+    global exporter
+    if exporter:
+        exporter.close()
+        exporter = None
 
 
 logging.basicConfig(
@@ -265,7 +330,7 @@ def autoformat(
     """
     lines = []
     if jsonfmt:
-        print_json(json.dumps(obj, default=str), indent=(indent + 1) * 2)
+        write_json(obj, indent=(indent + 1) * 2)
     else:
         if isinstance(obj, dict):
             lines = dict_formatter(obj, capitalize, indent, list_separator)
@@ -291,6 +356,8 @@ def autoformat(
             else:
                 console.print(line)
     else:
+        from rich.syntax import Syntax
+
         text = ""
         for line in lines:
             if isinstance(line, tuple):
@@ -302,6 +369,31 @@ def autoformat(
         return text
 
 
+def write_json(data: Any, indent: int = 2) -> None:
+    """Print data as JSON, bytes are taken as an already encoded document.
+
+    On a terminal it is highlighted by rich, otherwise it is formatted by
+    msgspec and written to stdout in chunks, without going through rich, so
+    large documents can be piped.
+    """
+
+    import msgspec
+
+    if not isinstance(data, bytes):
+        data = msgspec.json.encode(data, enc_hook=str)
+
+    if console.is_terminal or console.record:
+        console.print_json(data.decode(), indent=indent)
+        return
+
+    formatted = memoryview(msgspec.json.format(data, indent=indent))
+    out = sys.stdout.buffer
+    for start in range(0, len(formatted), JSON_CHUNK_SIZE):
+        out.write(formatted[start : start + JSON_CHUNK_SIZE])
+    out.write(b"\n")
+    out.flush()
+
+
 def flatten_list(items: list) -> list:
     out = []
     for item in items:
@@ -313,10 +405,8 @@ def flatten_list(items: list) -> list:
 
 
 def check_monitor(playbook):
-    with open(playbook) as stream:
-        config = yaml.safe_load(stream)
-        settings = config.get("settings", {})
-        return set() != {"rate", "cron"} & settings.keys()
+    settings = load_playbook(playbook).get("settings", {})
+    return set() != {"rate", "cron"} & settings.keys()
 
 
 def autosyntax(
@@ -324,7 +414,9 @@ def autosyntax(
     indent: int = 0,
     lexer: Optional[str] = None,
     echo: bool = True,
-) -> Union[bool, Syntax]:
+) -> Union[bool, "Syntax"]:
+    from rich.syntax import Syntax
+
     ind = (indent) * 2
     lang = None
     if lexer is None:
@@ -352,41 +444,106 @@ def autosyntax(
 
 def table_generator(
     headers: list[str],
-    items: list[list],
+    items: Iterable[list],
     header_style: Optional[str] = None,
     widths: Union[tuple, list] = [None],
 ):
     """Print a rich table
 
+    Tables longer than TABLE_SAMPLE_ROWS are printed in chunks of that size,
+    so they are not measured nor held in memory at once. The width of the
+    columns is taken from the first chunk, longer cells in the rest wrap.
+
     Parameters
     ----------
     headers : list
         A list of the headers names, ex: ["header1","header2"]
-    items : list
-        A list of rows with cells, ex: [["row1-1","row1-2"],["row2-1","row2-2"]]
+    items : Iterable[list]
+        Rows with cells, ex: [["row1-1","row1-2"],["row2-1","row2-2"]]
     header_style : str, optional
         Rich Table header style, by default None
     """
-    table = Table(
-        show_header=True,
-        header_style=header_style,
-        row_styles=["on #222222", "on black"],
-        expand=True,
-        highlight=True,
+    from rich.segment import SegmentLines
+
+    rows = (["-" if cell is None else str(cell) for cell in item] for item in items)
+    chunk = list(islice(rows, TABLE_SAMPLE_ROWS))
+    next_chunk = list(islice(rows, TABLE_SAMPLE_ROWS))
+    if next_chunk:
+        widths = sample_widths(headers, chunk, widths)
+    first = True
+
+    while chunk:
+        table = Table(
+            show_header=first,
+            header_style=header_style,
+            row_styles=["on #222222", "on black"],
+            expand=True,
+            highlight=True,
+        )
+        for header, width in zip_longest(headers, widths):
+            table.add_column(header, width=width)
+        for cells in chunk:
+            table.add_row(*cells)
+
+        if first and not next_chunk:
+            console.print(table)
+            return
+
+        # Stitch the chunks as a single table, the bottom border is dropped
+        # from all but the last chunk and the top border from all but the first
+        lines = console.render_lines(table, pad=False)
+        start = 0 if first else 1
+        end = len(lines) if not next_chunk else -1
+        console.print(SegmentLines(lines[start:end], new_lines=True))
+        flush_export()
+
+        first = False
+        chunk, next_chunk = next_chunk, list(islice(rows, TABLE_SAMPLE_ROWS))
+
+
+def sample_widths(
+    headers: list[str], rows: list[list[str]], widths: Union[tuple, list]
+) -> list[int]:
+    """Width of every column from a sample of rows, given widths are kept"""
+
+    sampled = []
+    for i, header in enumerate(headers):
+        width = widths[i] if i < len(widths) else None
+        if width is None:
+            width = max(
+                cell_len(line)
+                for cell in (header, *(row[i] for row in rows))
+                for line in cell.splitlines() or [""]
+            )
+        sampled.append(width)
+    return sampled
+
+
+def write_tsv(headers: list[str], rows: Iterable[list]) -> None:
+    """Write rows as tab separated values, tabs and newlines in the cells are
+    escaped so every row is a single line"""
+
+    out = console.file
+    out.write("\t".join(map(escape_tsv, headers)) + "\n")
+    for row in rows:
+        out.write("\t".join(map(escape_tsv, row)) + "\n")
+    out.flush()
+
+
+def escape_tsv(value: Any) -> str:
+    if value is None:
+        return ""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
     )
-    for header, width in zip_longest(headers, widths):
-        table.add_column(header, width=width)
-    for item in items:
-        cells = []
-        for raw_i in item:
-            i = "-" if raw_i is None else str(raw_i)
-            cells.append(i)
-        table.add_row(*cells)
-    console.print(table)
 
 
 def autotable(
-    items: Union[list[dict], BootstrapTable],
+    items: Union[list[dict], "BootstrapTable"],
     header_style: Optional[str] = None,
     numerate: Optional[bool] = False,
     widths: Union[tuple, list] = [None],
@@ -395,6 +552,9 @@ def autotable(
 ) -> None:
     """Print a list of dictionaries like a table
 
+    When stdout is not a terminal the rows are written as tab separated values
+    instead and the page footer goes to stderr.
+
     Parameters
     ----------
     items : list[dict]
@@ -404,6 +564,8 @@ def autotable(
     numerate : bool, optional
         Add numeration, by default False
     """
+    from satoricli.models import BootstrapTable
+
     is_bootstrap = isinstance(items, BootstrapTable)
     rows = items.rows if is_bootstrap else items
     if len(rows) == 0:
@@ -411,40 +573,39 @@ def autotable(
         return
     h = get_headers(rows)
     headers = ["N°", *h] if numerate else h
-    rows = get_rows(rows, headers)
-    table_generator(capitalize_list(headers), rows, header_style, widths)
+    out = console
 
-    if is_bootstrap and page and limit:
-        console.print(
-            f"Page {page} of {ceil(items.total / limit)} | Total: {items.total}"
+    if console.is_terminal or console.record:
+        table_generator(
+            capitalize_list(headers), iter_rows(rows, headers), header_style, widths
         )
+    else:
+        write_tsv(headers, iter_rows(rows, headers))
+        out = error_console
+
+    if is_bootstrap and page and limit:
+        out.print(f"Page {page} of {ceil(items.total / limit)} | Total: {items.total}")
 
 
 def get_headers(items: list[dict]) -> list[str]:
-    headers = []
+    # dict keeps the insertion order and makes the membership check O(1)
+    headers: dict[str, None] = {}
     for i in items:
-        for h in i.keys():
-            h = str(h)
-            if h not in headers:
-                headers.append(h)
-    return headers
+        for h in i:
+            headers.setdefault(str(h))
+    return list(headers)
+
+
+def iter_rows(items: list[dict], headers: list[str]) -> Iterator[list]:
+    for n, item in enumerate(items, 1):
+        yield [
+            str(n) if key == "N°" else item.get(key, "")  # add numeration
+            for key in headers
+        ]
 
 
 def get_rows(items: list[dict], headers: list[str]) -> list[list]:
-    rows = []
-    n = 0
-    for item in items:
-        n += 1
-        row = []
-        for key in headers:
-            if key == "N°":  # add numeration
-                row.append(str(n))
-            elif key in item:
-                row.append(item[key])
-            else:
-                row.append("")
-        rows.append(row)
-    return rows
+    return list(iter_rows(items, headers))
 
 
 def capitalize_list(items: list[str]) -> list[str]:
@@ -452,8 +613,27 @@ def capitalize_list(items: list[str]) -> list[str]:
     return list(new_list)
 
 
+def print_text(text: str) -> None:
+    """Print a block of command output as is.
+
+    Rich only renders it when the console is recording for --export, else the
+    whole block is written to the console file at once. Control characters
+    are removed like Rich does, on a terminal escape sequences too so remote
+    output can't drive it.
+    """
+
+    if console.record:
+        console.print(
+            text, highlight=False, markup=False, emoji=False, soft_wrap=True
+        )
+    elif console.is_terminal:
+        console.file.write(text.translate(TERMINAL_STRIP_TRANSLATE) + "\n")
+    else:
+        console.file.write(strip_control_codes(text) + "\n")
+
+
 def print_output_entry(
-    output: dict,
+    output: "Output",
     text_format: Literal["plain", "md"] = "plain",
     current_path: str = "",
 ) -> str:
@@ -462,69 +642,70 @@ def print_output_entry(
     Returns the entry's path so the caller can skip re-printing the rule when
     consecutive entries share the same path.
     """
+    from msgspec import UNSET
+    from rich.markdown import Markdown
+
     # A specific result was requested (e.g. test.run.stdout): print only the
     # raw value, no rule/Command/Testcase/header and no reflow, so it can be
     # piped (e.g. into jq).
-    if result := output.get("filtered_result"):
-        value = output["output"].get(result)
-        if value is not None:
+    if result := output.filtered_result:
+        value = getattr(output.output, result)
+        if value not in (None, UNSET):
             if text_format == "md":
                 console.print(Markdown(value))
             else:
-                console.print(value, highlight=False, markup=False, soft_wrap=True)
+                print_text(value)
         return current_path
 
-    if current_path != output["path"]:
-        console.rule(f"[b]{output['path']}[/b]")
-        current_path = output["path"]
+    if current_path != output.path:
+        console.rule(f"[b]{output.path}[/b]")
+        current_path = output.path
 
-    if output.get("original"):
-        console.print(f"[b][green]Command:[/green] {output['original']}[/b]")
+    if output.original:
+        console.print(f"[b][green]Command:[/green] {output.original}[/b]")
 
-    if output.get("testcase"):
+    if output.testcase:
         testcase = Table(show_header=False, show_edge=False)
 
         testcase.add_column(style="b")
         testcase.add_column()
 
-        for key, value in output["testcase"].items():
+        for key, value in output.testcase.items():
             testcase.add_row(key, value)
 
         console.print("[blue]Testcase:[/blue]")
         console.print(testcase)
 
-    output_dict = output["output"]
-    if output_dict.get("return_code") is not None:
-        console.print("[blue]Return code:[/blue]", output_dict["return_code"])
-    if "stdout" in output_dict and output_dict["stdout"] is not None:
+    command = output.output
+    if command.return_code not in (None, UNSET):
+        console.print("[blue]Return code:[/blue]", command.return_code)
+    if command.stdout not in (None, UNSET):
         console.print("[blue]Stdout:[/blue]")
-        text = output_dict["stdout"]
+        text = command.stdout
         if text_format == "md":
             text = Markdown(text)
             console.print(text)
         else:
-            for line in text.split("\n"):
-                console.print(line, highlight=False, markup=False)
-    if "stderr" in output_dict and output_dict["stderr"] is not None:
+            print_text(text)
+    if command.stderr not in (None, UNSET):
         console.print("[blue]Stderr:[/blue]")
-        for line in output_dict["stderr"].split("\n"):
-            console.print(line, highlight=False, markup=False)
-    if "os_error" in output_dict and output_dict["os_error"] is not None:
-        for line in output_dict["os_error"].split("\n"):
-            console.print(line, highlight=False, markup=False)
-    if "time" in output_dict:
-        console.print("[blue]Runtime:[/blue]", execution_time(output_dict["time"]))
+        print_text(command.stderr)
+    if command.os_error not in (None, UNSET):
+        print_text(command.os_error)
+    if command.time is not UNSET:
+        console.print("[blue]Runtime:[/blue]", execution_time(command.time))
 
     return current_path
 
 
 def format_outputs(
-    outputs: list,
+    outputs: list["Output"],
     text_format: Literal["plain", "md"] = "plain",
 ) -> None:
+    from rich.markdown import Markdown
+
     # If there is only one output and the output has only one element, print it directly
-    if len(outputs) == 1 and len(outputs[0]["output"]) == 1:
-        res = outputs[0]["output"]
+    if len(outputs) == 1 and len(res := outputs[0].output.present()) == 1:
         text = res[next(iter(res))]
         if text_format == "md":
             text = Markdown(text)
@@ -537,10 +718,11 @@ def format_outputs(
 
     for output in outputs:
         current_path = print_output_entry(output, text_format, current_path)
+        flush_export()
 
 
 def group_table(
-    table: BootstrapTable,
+    table: "BootstrapTable",
     key: str,
     default_group: str,
     page: int,
@@ -589,22 +771,23 @@ def wait(
     filter_tests: Optional[list] = None,
     text_format: Literal["plain", "md"] = "plain",
 ) -> None:
-    def _step_id(entry: dict) -> tuple:
-        return (
-            entry.get("path"),
-            entry.get("original"),
-            json.dumps(entry.get("testcase") or {}, sort_keys=True),
-        )
+    import msgspec
 
-    def _is_metadata_only(entry: dict) -> bool:
-        out = entry.get("output") or {}
+    from satoricli.models import Output
+    from satoricli.report_cache import set_status
+
+    def _step_id(entry: Output) -> tuple:
         return (
-            not (out.get("stdout") or "")
-            and not (out.get("stderr") or "")
-            and not (out.get("os_error") or "")
+            entry.path,
+            json.dumps(entry.original),
+            json.dumps(entry.testcase or {}, sort_keys=True),
         )
 
-    def _emit(entry: dict) -> None:
+    def _is_metadata_only(entry: Output) -> bool:
+        out = entry.output
+        return not (out.stdout or out.stderr or out.os_error)
+
+    def _emit(entry: Output) -> None:
         outputs = (
             run_test_filter(filter_tests, [entry]) if filter_tests else [entry]
         )
@@ -617,7 +800,7 @@ def wait(
     # multi-command step like `install` it only ever streams the first command
     # and drops the rest, scrambling order — so we poll /outputs instead.
     order: list[tuple] = []  # sids in canonical order, as first seen
-    seen: dict[tuple, dict] = {}  # sid -> richest entry seen so far
+    seen: dict[tuple, Output] = {}  # sid -> richest entry seen so far
     emitted: set[tuple] = set()
     emit_idx = 0
     # Every entry in /outputs is a finished command (the runner uploads only
@@ -630,7 +813,7 @@ def wait(
     empty_polls: dict[tuple, int] = {}
     OUTPUT_GRACE_POLLS = 3
 
-    def _record(entry: dict) -> None:
+    def _record(entry: Output) -> None:
         sid = _step_id(entry)
         if sid in emitted:
             return  # already printed
@@ -642,12 +825,12 @@ def wait(
 
     def _fetch_outputs() -> None:
         try:
-            res_json = client.get(f"/outputs/{report_id}").json()
-        except (httpx.TransportError, httpx.HTTPStatusError):
+            res = client.get(f"/outputs/{report_id}")
+            entries = msgspec.json.decode(res.content, type=list[Output])
+        except (httpx.TransportError, httpx.HTTPStatusError, msgspec.DecodeError):
             return
-        if isinstance(res_json, list):
-            for e in res_json:
-                _record(e)
+        for e in entries:
+            _record(e)
 
     def _drain(final: bool = False) -> None:
         """Emit steps strictly in canonical order (head-of-line on empties).
@@ -674,6 +857,8 @@ def wait(
             emitted.add(sid)
             emit_idx += 1
 
+        flush_export()
+
     with Progress(
         SpinnerColumn("dots2"),
         TextColumn("[progress.description]Status: {task.description}"),
@@ -698,6 +883,7 @@ def wait(
                 continue
 
             progress.update(task, description=status)
+            set_status(report_id, status)
 
             if live:
                 _fetch_outputs()
@@ -732,49 +918,92 @@ def print_output(
     text_format: Literal["plain", "md"] = "plain",
     unredacted: bool = False,
 ) -> None:
-    res = client.get(f"/outputs/{report_id}", params={"unredacted": unredacted}).json()
-    if filter_tests:  # Display only selected tests
-        res = run_test_filter(filter_tests, res)
+    from satoricli.models import Output
+    from satoricli.report_cache import get_outputs, get_outputs_raw
+
     if print_json:
-        console.print(res, highlight=False, markup=False)
+        # Keep every field of the payload
+        if not filter_tests:
+            write_json(get_outputs_raw(report_id, unredacted))
+            return
+
+        # Display only selected tests
+        write_json(
+            [
+                {
+                    **test,
+                    "output": {result: test["output"][result]},
+                    "filtered_result": result,
+                }
+                if result
+                else test
+                for test in get_outputs(report_id, unredacted)
+                for result in match_test_filter(filter_tests, test["path"])
+            ]
+        )
     else:
+        res = get_outputs(report_id, unredacted, list[Output])
+        if filter_tests:  # Display only selected tests
+            res = run_test_filter(filter_tests, res)
         format_outputs(res, text_format)
 
 
-def run_test_filter(filter_tests: list, tests: list) -> list:
-    # match test.echo | test.echo.stdout | test.echo.stderr | test.echo.os_error
-    output_regex = re.compile(
-        r"^(?P<path>[\w\.\-]+?)(\.(?P<result>(stdout|stderr|os_error)))?$"
-    )
+# match test.echo | test.echo.stdout | test.echo.stderr | test.echo.os_error
+TEST_FILTER_REGEX = re.compile(
+    r"^(?P<path>[\w\.\-]+?)(\.(?P<result>(stdout|stderr|os_error)))?$"
+)
+
+
+def match_test_filter(filter_tests: list, path: str) -> list[Optional[str]]:
+    """Results requested by every filter matching path, None for the whole
+    output"""
+
+    current_path = path.replace(":", ".")
+    results = []
+    for filter_test in filter_tests:
+        # Accept ':' as an alternative separator to '.' (matches the path's
+        # native form), so both `a.b.stdout` and `a:b:stdout` work.
+        m = TEST_FILTER_REGEX.match(filter_test.replace(":", "."))
+        if m and current_path == m.group("path"):
+            results.append(m.group("result"))
+    return results
+
+
+def run_test_filter(filter_tests: list, tests: list["Output"]) -> list["Output"]:
+    import msgspec
+
+    from satoricli.models import CommandOutput
+
     new_res = []
     for test in tests:
-        current_path = test["path"].replace(":", ".")
-        for filter_test in filter_tests:
-            # Accept ':' as an alternative separator to '.' (matches the path's
-            # native form), so both `a.b.stdout` and `a:b:stdout` work.
-            filter_test = filter_test.replace(":", ".")
-            # Check if every filter matches the current test
-            m = output_regex.match(filter_test)
-            if m and current_path == m.group("path"):
-                if result := m.group("result"):
-                    # Display only selected result
-                    test["output"] = {result: test["output"][result]}
-                    # Mark so the printer emits the raw value without decoration
-                    test["filtered_result"] = result
-                new_res.append(test)
+        for result in match_test_filter(filter_tests, test.path):
+            if result:
+                # Display only selected result and mark it so the printer
+                # emits the raw value without decoration
+                test = msgspec.structs.replace(
+                    test,
+                    output=CommandOutput(**{result: getattr(test.output, result)}),
+                    filtered_result=result,
+                )
+            new_res.append(test)
     return new_res
 
 
 def print_summary(report_id: str, print_json: bool = False):
-    report_data = client.get(f"/reports/{report_id}").json()
+    from msgspec import UNSET
 
-    if comments := report_data.get("user_warnings"):
+    from satoricli.models import ReportResult
+    from satoricli.report_cache import get_report
+
+    report_data = get_report(report_id, type=ReportResult)
+
+    if comments := report_data.user_warnings:
         error_console.print(f"[error]Error:[/] {comments}")
 
-    result = report_data.get("result", "Unknown")
+    result = report_data.result
 
-    if "fails" in report_data and result != "Unknown":
-        fails = report_data["fails"]
+    if report_data.fails is not UNSET and result != "Unknown":
+        fails = report_data.fails
         result = "Pass" if not fails else f"Fail({fails})"
     else:
         fails = 1
@@ -809,8 +1038,18 @@ def add_table_row(row_content: list, table: Table, echo: bool = True):
 
 
 def validate_config(playbook: Path, params: set):
+    from satorici.validator import validate_playbook
+    from satorici.validator.exceptions import (
+        NoExecutionsError,
+        PlaybookValidationError,
+        PlaybookVariableError,
+    )
+    from satorici.validator.warnings import MissingAssertionsWarning
+
+    from satoricli.validations import get_parameters, import_graph
+
     try:
-        config = yaml.safe_load(playbook.read_text())
+        config = load_playbook(playbook)
     except yaml.YAMLError as e:
         error_console.print(
             f"Error parsing the playbook [bold]{playbook.name}[/]:\n", e
@@ -835,7 +1074,7 @@ def validate_config(playbook: Path, params: set):
         )
         return False
 
-    if not has_executions(config, playbook.parent):
+    if not import_graph(playbook).has_executions():
         error_console.print("[error]No executions found")
         return False
 
@@ -848,14 +1087,13 @@ def validate_config(playbook: Path, params: set):
     return True
 
 
-def missing_ymls(playbook: dict, root: str):
-    local_ymls = list(filter(lambda p: p.is_file(), Path(root).rglob(".satori.yml")))
-    imported = get_local_files(playbook)["imports"]
+def missing_ymls(playbook: Path) -> bool:
+    """True if there are .satori.yml files next to or under the playbook that
+    are not imported by it, directly or through other imports"""
 
-    if len(local_ymls) > 1 and len(local_ymls) - 1 > len(imported):
-        return True
+    from satoricli.validations import import_graph
 
-    return False
+    return bool(import_graph(playbook).unimported_ymls())
 
 
 def get_offset(page, limit):
@@ -987,7 +1225,7 @@ def get_command_params(command: Optional[str]) -> Optional[str]:
     return " ".join(params)
 
 
-def date_formatter(value: str) -> str:
+def date_formatter(value: Optional[str]) -> str:
     """Convert 2023-08-16T08:00:41 to 2023-08-16 08:00"""
     date_regex = r"(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}):\d{2}"
 
@@ -0,0 +1,214 @@
+import contextlib
+import json
+import os
+import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from .api import ssl_ctx
+from .cache import atomic_write, read_cached
+
+SEGMENTS = 4
+SEGMENT_RETRIES = 3
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024  # 8MB
+STATE_SAVE_INTERVAL = 4 * 1024 * 1024  # 4MB
+CONTENT_RANGE_REGEX = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class DownloadError(Exception):
+    """Raised when the downloaded file does not match the advertised size"""
+
+
+class RangedDownload:
+    """Download a file of a known size in parallel segments with HTTP ranges.
+
+    The segments are written into a preallocated <path>.part file, their
+    progress is saved to <path>.part.json so an interrupted download resumes
+    where it stopped. The state is only reused for the same key and size,
+    presigned urls change between runs so they can't identify the file.
+    Servers that ignore ranges get a single full download.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        path: Path,
+        size: int,
+        key: str = "",
+        segments: int = SEGMENTS,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.url = url
+        self.path = path
+        self.size = size
+        self.key = key
+        self.on_progress = on_progress
+        self.part = path.with_name(f"{path.name}.part")
+        self.state_path = path.with_name(f"{path.name}.part.json")
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+        self.segments = self._load_state() or self._split(segments)
+
+    def _split(self, segments: int) -> list[list[int]]:
+        """[start, end, received] of every segment, end is exclusive"""
+
+        if not self.size:
+            return [[0, 0, 0]]
+
+        count = max(1, min(segments, self.size // MIN_SEGMENT_SIZE))
+        step = -(-self.size // count)
+        return [
+            [start, min(start + step, self.size), 0]
+            for start in range(0, self.size, step)
+        ]
+
+    def _load_state(self) -> Optional[list[list[int]]]:
+        if not (data := read_cached(self.state_path)):
+            return None
+
+        try:
+            state = json.loads(data)
+            if (
+                state["key"] != self.key
+                or state["size"] != self.size
+                or self.part.stat().st_size != self.size
+            ):
+                return None
+            return state["segments"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_state(self) -> None:
+        state = {"key": self.key, "size": self.size, "segments": self.segments}
+        with contextlib.suppress(OSError):
+            atomic_write(self.state_path, json.dumps(state).encode())
+
+    @property
+    def received(self) -> int:
+        return sum(segment[2] for segment in self.segments)
+
+    def _prepare(self) -> None:
+        """Create the preallocated part file, unless the state is resumed"""
+
+        if self.received and self.part.exists():
+            return
+
+        for segment in self.segments:
+            segment[2] = 0
+        with self.part.open("wb") as f:
+            f.truncate(self.size)
+        self._save_state()
+
+    def run(self) -> None:
+        self._prepare()
+
+        try:
+            # Empty files have nothing to fetch
+            if self.received < self.size:
+                self._fetch()
+        finally:
+            # Only bytes already written are counted, saving is always safe
+            self._save_state()
+
+        if self.part.stat().st_size != self.size or self.received != self.size:
+            raise DownloadError(
+                f"Downloaded {self.received} bytes, expected {self.size}"
+            )
+
+        os.replace(self.part, self.path)
+        self.state_path.unlink(missing_ok=True)
+
+    def _fetch(self) -> None:
+        with httpx.Client(
+            verify=ssl_ctx,
+            follow_redirects=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=len(self.segments)),
+        ) as http:
+            if not self._supports_ranges(http):
+                self.segments = self._split(1)
+                self._fetch_whole(http)
+            else:
+                with ThreadPoolExecutor(len(self.segments)) as executor:
+                    for future in [
+                        executor.submit(self._fetch_segment, http, segment)
+                        for segment in self.segments
+                        if segment[0] + segment[2] < segment[1]
+                    ]:
+                        future.result()
+
+    def _supports_ranges(self, http: httpx.Client) -> bool:
+        with http.stream("GET", self.url, headers={"Range": "bytes=0-0"}) as res:
+            res.raise_for_status()
+            content_range = res.headers.get("content-range", "")
+            match = CONTENT_RANGE_REGEX.fullmatch(content_range)
+            if res.status_code != 206 or not match:
+                return False
+            if match[3] != "*" and int(match[3]) != self.size:
+                raise DownloadError(
+                    f"The server has {match[3]} bytes, expected {self.size}"
+                )
+            return True
+
+    def _fetch_whole(self, http: httpx.Client) -> None:
+        segment = self.segments[0]
+        with http.stream("GET", self.url) as res:
+            res.raise_for_status()
+            with self.part.open("wb") as f:
+                for chunk in res.iter_bytes():
+                    f.write(chunk)
+                    self._advance(segment, len(chunk))
+
+    def _fetch_segment(self, http: httpx.Client, segment: list[int]) -> None:
+        for attempt in range(SEGMENT_RETRIES):
+            start = segment[0] + segment[2]
+            headers = {"Range": f"bytes={start}-{segment[1] - 1}"}
+            try:
+                with http.stream("GET", self.url, headers=headers) as res:
+                    res.raise_for_status()
+                    if res.status_code != 206:
+                        raise DownloadError("The server ignored the range request")
+                    # A handle per segment, unbuffered so the saved state
+                    # never counts bytes that are not in the file yet
+                    with self.part.open("r+b", buffering=0) as f:
+                        f.seek(start)
+                        for chunk in res.iter_bytes():
+                            chunk = chunk[: segment[1] - (segment[0] + segment[2])]
+                            f.write(chunk)
+                            self._advance(segment, len(chunk))
+                if segment[0] + segment[2] >= segment[1]:
+                    return
+            except httpx.TransportError:
+                if attempt == SEGMENT_RETRIES - 1:
+                    raise
+
+        raise DownloadError(f"Segment at {segment[0]} ended early")
+
+    def _advance(self, segment: list[int], size: int) -> None:
+        with self._lock:
+            segment[2] += size
+            self._unsaved += size
+            if self._unsaved >= STATE_SAVE_INTERVAL:
+                self._unsaved = 0
+                self._save_state()
+        if self.on_progress is not None:
+            self.on_progress(self.received, self.size)
+
+
+def download_file(
+    url: str,
+    path: Path,
+    size: int,
+    key: str = "",
+    segments: int = SEGMENTS,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> None:
+    """Download url to path in parallel ranges, resuming a previous attempt"""
+
+    RangedDownload(url, path, size, key, segments, on_progress).run()
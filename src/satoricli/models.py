@@ -0,0 +1,113 @@
+"""Typed views of the API responses the CLI walks through.
+
+They are decoded with msgspec straight from the response body and only declare
+the fields the CLI reads, the rest of the payload is skipped while decoding.
+Fields whose presence matters default to UNSET instead of None.
+"""
+
+from typing import Any, Union
+
+from msgspec import UNSET, Struct, UnsetType, field
+
+MaybeStr = Union[str, None, UnsetType]
+
+
+class BootstrapTable(Struct):
+    """Based on https://bootstrap-table.com/docs/api/table-options/#url."""
+
+    total: int
+    totalNotFiltered: int  # noqa: N815
+    rows: list[dict]
+    last_id: Union[str, None] = None
+    last_timestamp: Union[str, None] = None
+    finished: bool = False
+
+
+class CommandOutput(Struct, omit_defaults=True):
+    return_code: Union[int, None, UnsetType] = UNSET
+    stdout: MaybeStr = UNSET
+    stderr: MaybeStr = UNSET
+    os_error: MaybeStr = UNSET
+    time: Union[float, None, UnsetType] = UNSET
+
+    def present(self) -> dict[str, Any]:
+        """Fields that were set, like the keys of the original mapping"""
+
+        return {
+            name: value
+            for name in self.__struct_fields__
+            if (value := getattr(self, name)) is not UNSET
+        }
+
+
+class Output(Struct, omit_defaults=True):
+    path: str = ""
+    output: CommandOutput = field(default_factory=CommandOutput)
+    original: Any = None
+    testcase: Union[dict[str, Any], None] = None
+    # Set by run_test_filter when a single result was requested
+    filtered_result: Union[str, None] = None
+
+
+class ReportResult(Struct):
+    status: Union[str, None] = None
+    result: Union[str, None] = "Unknown"
+    fails: Union[int, None, UnsetType] = UNSET
+    user_warnings: Any = None
+    run_params: Union[str, None] = None
+    report: Any = None
+
+
+class SearchRow(Struct):
+    id: str
+    run_params: Union[str, None] = None
+    playbook_path: MaybeStr = UNSET
+    playbook_uri: Union[str, None] = None
+    playbook_name: Any = None
+    execution: Any = None
+    status: Union[str, None] = None
+    result: Any = None
+    execution_time: Any = UNSET
+    run_time: Any = None
+    date: Union[str, None] = None
+
+    @property
+    def path(self) -> Union[str, None]:
+        if self.playbook_path is UNSET:
+            return self.playbook_uri
+        return self.playbook_path
+
+    @property
+    def runtime(self) -> Any:
+        if self.execution_time is UNSET:
+            return self.run_time
+        return self.execution_time
+
+
+class SearchPage(Struct):
+    rows: list[SearchRow] = []
+    last_id: Union[str, None] = None
+    total: Union[int, None] = None
+
+
+class SearchCursor(Struct):
+    """Only the cursor of a search page, the rows are skipped"""
+
+    last_id: Union[str, None] = None
+
+
+class DownloadedReport(Struct):
+    """Report saved by reports download, the fields the local query filters"""
+
+    result: Any = None
+    status: Any = None
+    playbook_path: Any = None
+    playbook_uri: Any = None
+    playbook_name: Any = None
+    playbook_type: Any = None
+    visibility: Any = None
+    monitor: Any = None
+    execution: Any = None
+    repo: Any = None
+    date: Any = None
+    report: Any = None
@@ -0,0 +1,155 @@
+"""Reports stored in a few rolling segment files instead of a file per report.
+
+Every report is appended to the current segment as a msgpack record and its
+position is logged to index.jsonl, so a single report is read with one seek.
+A segment is closed once it grows past PACK_SEGMENT_SIZE.
+"""
+
+import os
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import msgspec
+from msgspec import Struct, json, msgpack
+
+PACK_DIR = "pack"
+PACK_INDEX = "index.jsonl"
+PACK_SEGMENT_SIZE = 256 * 1024 * 1024  # 256MB
+
+
+class PackedReport(Struct, array_like=True):
+    id: str
+    output: str
+    report: bytes
+
+
+class PackEntry(Struct, array_like=True):
+    id: str
+    segment: int
+    offset: int
+    size: int
+
+
+def _segment_path(root: Path, segment: int) -> Path:
+    return root / PACK_DIR / f"segment-{segment:05d}.msgpack"
+
+
+class PackWriter:
+    """Append reports to the pack of a download directory"""
+
+    def __init__(self, root: Path, segment_size: int = PACK_SEGMENT_SIZE):
+        self.root = root
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._encoder = msgpack.Encoder()
+        (root / PACK_DIR).mkdir(parents=True, exist_ok=True)
+
+        # Continue the last segment, bytes a crash left past the last indexed
+        # entry are never referenced
+        segments = sorted((root / PACK_DIR).glob("segment-*.msgpack"))
+        self.segment = (
+            int(segments[-1].stem.removeprefix("segment-")) if segments else 0
+        )
+        index = root / PACK_DIR / PACK_INDEX
+        self._index = index.open("ab")
+        if self._index.tell():
+            with index.open("rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Line cut by a crash, the next entry goes on its own line
+                    self._index.write(b"\n")
+        self._file = _segment_path(root, self.segment).open("ab")
+
+    def append(self, report: PackedReport) -> None:
+        data = self._encoder.encode(report)
+
+        with self._lock:
+            size = self._file.tell()
+            if size and size + len(data) > self.segment_size:
+                self._file.close()
+                self.segment += 1
+                self._file = _segment_path(self.root, self.segment).open("ab")
+
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            entry = PackEntry(report.id, self.segment, offset, len(data))
+            self._index.write(json.encode(entry) + b"\n")
+            self._index.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PackReader:
+    """Iterate or look up the reports of a pack without extracting them"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.entries: list[PackEntry] = []
+        self.positions: dict[str, int] = {}
+        sizes: dict[int, int] = {}
+
+        with (root / PACK_DIR / PACK_INDEX).open("rb") as f:
+            for line in f:
+                try:
+                    entry = json.decode(line, type=PackEntry)
+                except msgspec.MsgspecError:
+                    continue
+
+                if entry.segment not in sizes:
+                    try:
+                        sizes[entry.segment] = _segment_path(
+                            root, entry.segment
+                        ).stat().st_size
+                    except OSError:
+                        sizes[entry.segment] = 0
+                if entry.offset + entry.size > sizes[entry.segment]:
+                    continue
+
+                # A report saved twice keeps its last copy
+                self.positions[entry.id] = len(self.entries)
+                self.entries.append(entry)
+
+    @staticmethod
+    def exists(root: Path) -> bool:
+        return (root / PACK_DIR / PACK_INDEX).is_file()
+
+    def ids(self) -> list[str]:
+        return list(self.positions)
+
+    def get(self, report_id: str) -> Optional[PackedReport]:
+        if (position := self.positions.get(report_id)) is None:
+            return None
+
+        entry = self.entries[position]
+        with _segment_path(self.root, entry.segment).open("rb") as f:
+            f.seek(entry.offset)
+            return msgpack.decode(f.read(entry.size), type=PackedReport)
+
+    def __iter__(self) -> Iterator[PackedReport]:
+        decoder = msgpack.Decoder(PackedReport)
+        current = None
+        f: Optional[BinaryIO] = None
+        try:
+            for position in self.positions.values():
+                entry = self.entries[position]
+                if f is None or entry.segment != current:
+                    if f:
+                        f.close()
+                    f = _segment_path(self.root, entry.segment).open("rb")
+                    current = entry.segment
+                f.seek(entry.offset)
+                yield decoder.decode(f.read(entry.size))
+        finally:
+            if f:
+                f.close()
@@ -0,0 +1,421 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import stat
+import tarfile
+import tempfile
+import uuid
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from .cache import CACHE_DIR, atomic_write, read_cached
+
+DEFAULT_COMPRESS_LEVEL = 6
+BLOCK_SIZE = 1024 * 1024  # 1MB
+MANIFEST_CACHE_DIR = CACHE_DIR / "manifests"
+MANIFEST_NAME = ".satori-manifest.json"
+
+
+def _compress_block(block: bytes, level: int) -> bytes:
+    # wbits=31 emits a complete gzip member (header, deflate data and trailer)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(block) + compressor.flush()
+
+
+class ParallelGzipWriter:
+    """Write-only file object that gzips fixed size blocks on a thread pool.
+
+    Every block is emitted as an independent gzip member, concatenated members
+    are still a single valid gzip stream (the same approach pigz uses). zlib
+    releases the GIL while deflating, so the blocks compress in parallel.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        level: int = DEFAULT_COMPRESS_LEVEL,
+        workers: Optional[int] = None,
+        block_size: int = BLOCK_SIZE,
+    ):
+        self._fileobj = fileobj
+        self._level = level
+        self._block_size = block_size
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(self._workers)
+        self._pending: deque[Future[bytes]] = deque()
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[: self._block_size]))
+            del self._buffer[: self._block_size]
+
+        return len(data)
+
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(
+            self._executor.submit(_compress_block, block, self._level)
+        )
+
+        # Keep memory bounded: at most two blocks in flight per worker
+        while len(self._pending) > self._workers * 2:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regex matching a relative posix path"""
+
+    regex = ""
+    i = 0
+    n = len(pattern)
+
+    if pattern.startswith("**/"):
+        regex = "(?:.*/)?"
+        i = 3
+
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith("/**/", i):
+            regex += "/(?:.*/)?"
+            i += 4
+            continue
+        if pattern.startswith("/**", i) and i + 3 == n:
+            regex += "/.*"
+            i += 3
+            continue
+
+        if char == "*":
+            if pattern.startswith("**", i):
+                regex += ".*"
+                i += 2
+                continue
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and (end := pattern.find("]", i + 2)) != -1:
+            content = pattern[i + 1 : end].replace("\\", "\\\\")
+            if content[0] in "!^":
+                content = "^" + content[1:]
+            regex += f"[{content}]"
+            i = end
+        elif char == "\\" and i + 1 < n:
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+
+    return regex
+
+
+class IgnoreRules:
+    """Patterns of a single ignore file compiled into one regex per entry type.
+
+    The patterns are joined in reverse order as alternatives with one capture
+    group each, so the group that matches is the last matching pattern of the
+    file (gitignore's last-match-wins rule) and is found with a single search.
+    """
+
+    def __init__(self, lines: list[str], base: str = ""):
+        self.base = base
+        rules: list[tuple[str, bool, bool]] = []
+
+        for raw in lines:
+            line = raw.rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negated = line.startswith("!")
+            if negated or line.startswith(("\\!", "\\#")):
+                line = line[1:]
+
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+
+            # A slash anywhere but the end anchors the pattern to this directory
+            regex = _translate(line.removeprefix("/"))
+            if "/" not in line:
+                regex = "(?:.*/)?" + regex
+
+            rules.append((regex, negated, dir_only))
+
+        self._dirs = self._compile(rules)
+        self._files = self._compile([rule for rule in rules if not rule[2]])
+
+    @staticmethod
+    def _compile(rules: list[tuple[str, bool, bool]]):
+        if not rules:
+            return None
+
+        rules = rules[::-1]
+        regex = "|".join(f"({rule[0]})" for rule in rules)
+        # Group indexes are 1-based, the extra first item keeps them aligned
+        return re.compile(regex, re.DOTALL), (False, *(rule[1] for rule in rules))
+
+    @classmethod
+    def from_file(cls, path: Path, base: str = "") -> Optional["IgnoreRules"]:
+        try:
+            lines = path.read_text(errors="replace").splitlines()
+        except OSError:
+            return None
+
+        rules = cls(lines, base)
+        return rules if rules._dirs else None
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included and None if nothing matches"""
+
+        compiled = self._dirs if is_dir else self._files
+        if compiled is None:
+            return None
+
+        if self.base:
+            rel = rel[len(self.base) + 1 :]
+
+        regex, negated = compiled
+        if m := regex.fullmatch(rel):
+            return not negated[m.lastindex or 0]
+
+        return None
+
+
+def is_ignored(rules: list[IgnoreRules], rel: str, is_dir: bool) -> bool:
+    # Deeper ignore files take precedence over the ones in parent directories
+    for rule in reversed(rules):
+        if (ignored := rule.match(rel, is_dir)) is not None:
+            return ignored
+
+    return False
+
+
+def iter_tree(base: Path, gitignore: bool = False) -> Iterator[tuple[str, str]]:
+    """Yield (path, arcname) for every entry under base, parents first.
+
+    With gitignore the patterns of .git/info/exclude and every .gitignore found
+    are honoured and ignored directories are pruned instead of walked.
+    """
+
+    rules: list[IgnoreRules] = []
+    if gitignore and (exclude := IgnoreRules.from_file(base / ".git/info/exclude")):
+        rules.append(exclude)
+
+    stack = [(str(base), "", rules)]
+
+    while stack:
+        path, rel_dir, rules = stack.pop()
+
+        if gitignore and (
+            nested := IgnoreRules.from_file(Path(path, ".gitignore"), rel_dir)
+        ):
+            rules = [*rules, nested]
+
+        subdirs = []
+
+        # Sorted, the same tree packs in the same order on every filesystem
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+
+            if gitignore and (
+                # Always skip the .git directory
+                entry.name == ".git" or is_ignored(rules, rel, is_dir)
+            ):
+                continue
+
+            yield entry.path, rel
+
+            if is_dir:
+                subdirs.append((entry.path, rel, rules))
+
+        stack.extend(reversed(subdirs))
+
+
+def write_packet(
+    entries: Iterator[tuple[str, str]],
+    fileobj: BinaryIO,
+    level: int = DEFAULT_COMPRESS_LEVEL,
+    workers: Optional[int] = None,
+) -> None:
+    """Stream entries into a tar.gz written to fileobj in a single pass"""
+
+    with ParallelGzipWriter(fileobj, level, workers) as gz:
+        with tarfile.open(fileobj=gz, mode="w|") as tar:  # type: ignore[arg-type]
+            for path, arcname in entries:
+                tar.add(path, arcname=arcname, recursive=False)
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(BLOCK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_tree(
+    base: Path,
+    gitignore: bool = False,
+    previous: Optional[dict[str, list]] = None,
+    workers: Optional[int] = None,
+) -> dict[str, list]:
+    """Map the arcname of every entry to [mtime_ns, size, digest].
+
+    The digest of a regular file is its sha256, directories and symlinks are
+    listed too ("dir" and "symlink:<target>", size -1) so a delta carries
+    them like the full packet. Hashes of files whose mtime and size did not
+    change since the previous manifest are reused, the rest are hashed in
+    parallel.
+    """
+
+    previous = previous or {}
+    manifest: dict[str, list] = {}
+    pending: dict[str, str] = {}
+
+    for path, rel in iter_tree(base, gitignore):
+        info = os.lstat(path)
+        if stat.S_ISDIR(info.st_mode):
+            # The mtime of a directory changes with its entries, leave it out
+            manifest[rel] = [0, -1, "dir"]
+            continue
+        if stat.S_ISLNK(info.st_mode):
+            manifest[rel] = [info.st_mtime_ns, -1, f"symlink:{os.readlink(path)}"]
+            continue
+        if not stat.S_ISREG(info.st_mode):
+            continue
+
+        signature = [info.st_mtime_ns, info.st_size]
+        old = previous.get(rel)
+        if old and old[:2] == signature:
+            manifest[rel] = old
+        else:
+            manifest[rel] = signature
+            pending[rel] = path
+
+    with ThreadPoolExecutor(workers or os.cpu_count()) as executor:
+        for rel, digest in zip(pending, executor.map(_hash_file, pending.values())):
+            manifest[rel].append(digest)
+
+    return manifest
+
+
+def manifest_digest(manifest: dict[str, list]) -> str:
+    hashes = {rel: signature[2] for rel, signature in manifest.items()}
+    return hashlib.sha256(json.dumps(hashes, sort_keys=True).encode()).hexdigest()
+
+
+def _manifest_path(base: Path) -> Path:
+    key = hashlib.sha256(str(base.resolve()).encode()).hexdigest()
+    return MANIFEST_CACHE_DIR / f"{key}.json"
+
+
+class DeltaPacket:
+    """Directory packet that only carries the files changed since the last upload.
+
+    The manifest of the last successful upload is kept per directory and its
+    digest is sent with the run. Storage that tracks manifests answers with
+    the digest of the tree it holds in the "manifest" key of the upload data,
+    only then the directory is hashed. When that digest is the one of our
+    last upload, the packet contains the changed entries plus a manifest
+    listing every entry and the deleted ones, otherwise the full directory is
+    packed.
+    """
+
+    def __init__(
+        self, base: Path, gitignore: bool, level: int = DEFAULT_COMPRESS_LEVEL
+    ):
+        self.base = base
+        self.gitignore = gitignore
+        self.level = level
+        self.previous: dict[str, list] = {}
+        self.manifest: Optional[dict[str, list]] = None
+
+        if cached := read_cached(_manifest_path(base)):
+            with contextlib.suppress(ValueError):
+                self.previous = json.loads(cached)
+
+        self.base_digest = (
+            manifest_digest(self.previous) if self.previous else None
+        )
+
+    def build(self, upload_data: dict) -> str:
+        temp_file = Path(tempfile.gettempdir(), f"{uuid.uuid4()}.tar.gz")
+
+        if "manifest" in upload_data:
+            self.manifest = hash_tree(self.base, self.gitignore, self.previous)
+
+        with temp_file.open("wb") as f:
+            server_digest = upload_data.get("manifest")
+            if (
+                self.manifest is not None
+                and server_digest
+                and server_digest == self.base_digest
+            ):
+                self._write_delta(f, self.manifest)
+            else:
+                write_packet(iter_tree(self.base, self.gitignore), f, self.level)
+
+        return str(temp_file)
+
+    def _write_delta(self, fileobj: BinaryIO, manifest: dict[str, list]) -> None:
+        changed = [
+            rel
+            for rel, signature in manifest.items()
+            if self.previous.get(rel, [None] * 3)[2] != signature[2]
+        ]
+        data = json.dumps(
+            {
+                "base": self.base_digest,
+                "files": {rel: sig[2] for rel, sig in manifest.items()},
+                "deleted": sorted(set(self.previous) - set(manifest)),
+            }
+        ).encode()
+
+        with ParallelGzipWriter(fileobj, self.level) as gz:
+            with tarfile.open(fileobj=gz, mode="w|") as tar:  # type: ignore[arg-type]
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+                for rel in changed:
+                    tar.add(self.base / rel, arcname=rel, recursive=False)
+
+    def save(self) -> None:
+        """Remember the manifest once the upload succeeded, if the storage
+        tracks them"""
+
+        if self.manifest is None:
+            return
+
+        with contextlib.suppress(OSError):
+            atomic_write(_manifest_path(self.base), json.dumps(self.manifest).encode())
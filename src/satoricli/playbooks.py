@@ -1,23 +1,189 @@
+import bisect
 import contextlib
+import json
+import re
+import time
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Optional
 
-import yaml
 from rich.markdown import Markdown
 from rich.panel import Panel
-from satorici.validator import validate_playbook
+from satorici.validator import is_command_group, validate_playbook
 from satorici.validator.exceptions import PlaybookVariableError
 
 from satoricli.api import client
 
-from .cli.utils import autosyntax, autotable, console, error_console, remove_yaml_prop
-from .validations import get_parameters
+from .cache import CACHE_DIR, atomic_write, cache_enabled, read_cached
+from .cli.utils import (
+    autosyntax,
+    autotable,
+    console,
+    error_console,
+    flatten_list,
+    log,
+    remove_yaml_prop,
+)
+from .utils import safe_load
+from .validations import get_parameters, iter_leaves
 
 PLAYBOOKS_DIR = Path.home() / ".satori/playbooks"
+PLAYBOOKS_INDEX = CACHE_DIR / "playbooks-index.json"
+PLAYBOOKS_INDEX_VERSION = 2
+PLAYBOOKS_SYNC_TTL = 60 * 60  # once an hour
 
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+# Score of a search term found on each playbook field
+FIELD_WEIGHTS = {"name": 4, "path": 3, "parameters": 3, "description": 2, "commands": 1}
 
-def sync():
-    """Clone or pull the playbooks repo"""
+
+def _is_playbook(relpath: str) -> bool:
+    parts = relpath.split("/")
+    return (
+        relpath.endswith(".yml") and ".github" not in parts and parts[-1] != ".satori.yml"
+    )
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_REGEX.findall(text.lower())
+
+
+def get_tokens(relpath: str, config: dict, settings: dict, parameters: list[str]):
+    """Map every search token of a playbook to its highest field weight"""
+
+    fields = {
+        "name": [settings.get("name")],
+        "path": [relpath.removesuffix(".yml")],
+        "parameters": parameters,
+        "description": [settings.get("description")],
+        "commands": [
+            command
+            for _path, value in iter_leaves(config)
+            if is_command_group(value)
+            for command in flatten_list(value)
+        ],
+    }
+    tokens: dict[str, int] = {}
+
+    for field, values in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for value in values:
+            if not isinstance(value, str):
+                continue
+
+            for token in tokenize(value):
+                tokens[token] = max(tokens.get(token, 0), weight)
+
+    return tokens
+
+
+def index_playbook(path: Path, relpath: str) -> Optional[dict]:
+    """Parse a public playbook once and keep what the listings and the search
+    need"""
+
+    try:
+        config = safe_load(path.read_bytes())
+    except Exception:
+        return None
+
+    if not isinstance(config, dict):
+        return None
+
+    settings = config.get("settings")
+    if not isinstance(settings, dict):
+        settings = {}
+
+    try:
+        parameters = sorted(get_parameters(config))
+    except Exception:
+        parameters = []
+
+    return {
+        "name": settings.get("name"),
+        "scheme": settings.get("scheme", "satori"),
+        "parameters": parameters,
+        "tokens": get_tokens(relpath, config, settings, parameters),
+    }
+
+
+def load_index() -> Optional[dict]:
+    if not cache_enabled() or (data := read_cached(PLAYBOOKS_INDEX)) is None:
+        return None
+
+    try:
+        index = json.loads(data)
+        if index["version"] == PLAYBOOKS_INDEX_VERSION:
+            return index
+    except (ValueError, KeyError, TypeError):
+        pass
+
+    return None
+
+
+def build_index(repo, index: Optional[dict]) -> dict:
+    """Index the playbooks at HEAD, reusing the entries of files that did not
+    change since the commit of the previous index"""
+
+    head = repo.head.commit.hexsha
+    changed: Optional[Iterable[str]] = None
+
+    if index and index["head"] == head:
+        return index
+
+    if index:
+        playbooks: dict[str, dict] = index["playbooks"]
+        # The old commit may be gone after a force push, rebuild in that case
+        with contextlib.suppress(Exception):
+            changed = repo.git.diff(
+                "--name-only", "--no-renames", index["head"], head
+            ).splitlines()
+
+    if changed is None:
+        playbooks = {}
+        changed = (
+            path.relative_to(PLAYBOOKS_DIR).as_posix()
+            for path in PLAYBOOKS_DIR.rglob("*.yml")
+        )
+
+    for relpath in changed:
+        playbooks.pop(relpath, None)
+
+        if _is_playbook(relpath) and (entry := index_playbook(PLAYBOOKS_DIR / relpath, relpath)):
+            playbooks[relpath] = entry
+
+    # Inverted index, token -> {relpath: weight}
+    terms: dict[str, dict[str, int]] = {}
+    for relpath, entry in playbooks.items():
+        for token, weight in entry["tokens"].items():
+            terms.setdefault(token, {})[relpath] = weight
+
+    return {
+        "version": PLAYBOOKS_INDEX_VERSION,
+        "head": head,
+        "playbooks": playbooks,
+        "terms": terms,
+        # Sorted, the tokens a word is a prefix of are a contiguous run
+        "tokens": sorted(terms),
+    }
+
+
+def sync(force: bool = False) -> Optional[dict]:
+    """Clone or pull the playbooks repo and return its index.
+
+    The repo is only pulled once PLAYBOOKS_SYNC_TTL has passed since the last
+    sync, if it can't be pulled the current checkout is used. If it can't be
+    cloned or checked out, the last index is returned, if any.
+    """
+
+    index = load_index()
+
+    if (
+        not force
+        and index
+        and PLAYBOOKS_DIR.is_dir()
+        and time.time() - index.get("synced", 0) < PLAYBOOKS_SYNC_TTL
+    ):
+        return index
 
     try:
         import git
@@ -26,68 +192,100 @@ def sync():
             "The git package could not be imported.",
             "Please make sure that git is installed in your system.",
         )
-        return False
-
-    if PLAYBOOKS_DIR.is_dir():
-        repo = git.Repo(PLAYBOOKS_DIR)
-        repo.branches["main"].checkout(force=True)
-        repo.remote().pull()
-        # print(
-        #    "Satori playbooks' repo https://github.com/satorici/playbooks",
-        #    "updated to latest version",
-        # )
-    else:
-        git.Repo.clone_from("https://github.com/satorici/playbooks.git", PLAYBOOKS_DIR)
-        # print("Satori Playbooks repo clone started")
-    return True
-
-
-def file_finder() -> list[dict]:
-    playbooks = []
-
-    for playbook in PLAYBOOKS_DIR.rglob("*.yml"):
-        if ".github" in playbook.parts or playbook.name == ".satori.yml":
-            continue
-
-        try:
-            parameters = get_parameters(yaml.safe_load(playbook.read_text()))
-        except Exception:
-            parameters = ()
-
-        scheme = (
-            yaml.safe_load(playbook.read_bytes())
-            .get("settings", {})
-            .get("scheme", "satori")
-        )
+        return index if PLAYBOOKS_DIR.is_dir() else None
 
-        playbooks.append(
-            {
-                "uri": f"{scheme}://" + playbook.relative_to(PLAYBOOKS_DIR).as_posix(),
-                "name": get_playbook_name(playbook),
-                "parameters": ", ".join(parameters),
-            }
-        )
+    try:
+        if PLAYBOOKS_DIR.is_dir():
+            repo = git.Repo(PLAYBOOKS_DIR)
+            repo.branches["main"].checkout(force=True)
+            try:
+                repo.remote().pull()
+            except git.GitCommandError:
+                log.warning("Unable to update the playbooks repo, using local copy")
+        else:
+            repo = git.Repo.clone_from(
+                "https://github.com/satorici/playbooks.git", PLAYBOOKS_DIR
+            )
+    except git.GitError:
+        # Also covers a broken checkout, keep whatever was indexed before
+        log.warning("Unable to sync the playbooks repo")
+        return index if PLAYBOOKS_DIR.is_dir() else None
 
-    return playbooks
+    index = build_index(repo, index)
+    index["synced"] = time.time()
 
+    with contextlib.suppress(OSError):
+        atomic_write(PLAYBOOKS_INDEX, json.dumps(index).encode())
 
-def get_playbook_name(filename: Path):
-    try:
-        config = yaml.safe_load(filename.read_text())
-        return config["settings"]["name"]
-    except Exception:
-        pass
+    return index
+
+
+def _playbook_row(relpath: str, entry: dict) -> dict:
+    return {
+        "uri": f"{entry['scheme']}://{relpath}",
+        "name": entry["name"],
+        "parameters": ", ".join(entry["parameters"]),
+    }
+
+
+def file_finder(index: Optional[dict] = None) -> list[dict]:
+    if index is None and (index := sync()) is None:
+        return []
+
+    return [
+        _playbook_row(relpath, entry) for relpath, entry in index["playbooks"].items()
+    ]
+
+
+def search_playbooks(index: dict, query: str) -> list[dict]:
+    """Playbooks matching every word of query, best matches first.
+
+    A word matches the tokens it is a prefix of, whole token matches score
+    double.
+    """
+
+    words = tokenize(query)
+    terms: dict[str, dict[str, int]] = index["terms"]
+    tokens: list[str] = index["tokens"]
+    scores: dict[str, int] = {}
+
+    for i, word in enumerate(words):
+        hits: dict[str, int] = {}
+
+        # Tokens only hold [a-z0-9], "{" sorts after all of them
+        start = bisect.bisect_left(tokens, word)
+        end = bisect.bisect_left(tokens, word + "{", start)
+
+        for token in tokens[start:end]:
+            factor = 2 if token == word else 1
+            for relpath, weight in terms[token].items():
+                hits[relpath] = max(hits.get(relpath, 0), weight * factor)
+
+        if i == 0:
+            scores = hits
+        else:
+            scores = {
+                relpath: score + hits[relpath]
+                for relpath, score in scores.items()
+                if relpath in hits
+            }
+
+        if not scores:
+            break
+
+    ranked = sorted(scores, key=lambda relpath: (-scores[relpath], relpath))
+    return [_playbook_row(relpath, index["playbooks"][relpath]) for relpath in ranked]
 
 
 def display_public_playbooks(
     playbook_id: Optional[str] = None,
     original: bool = False,
 ) -> None:
-    if not sync():
-        return
-
     if not playbook_id:  # satori playbook --public
-        playbooks = file_finder()
+        if (index := sync()) is None:
+            return
+
+        playbooks = file_finder(index)
         playbooks.sort(key=lambda x: x["uri"])
         autotable(playbooks)
     else:  # satori playbook satori://x
@@ -103,7 +301,7 @@ def display_public_playbooks(
             if original:
                 print(text)
                 return
-            loaded_yaml = yaml.safe_load(text)
+            loaded_yaml = safe_load(text)
 
             with contextlib.suppress(PlaybookVariableError):
                 validate_playbook(loaded_yaml)
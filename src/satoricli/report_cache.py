@@ -0,0 +1,212 @@
+"""Reports and outputs that reached a terminal state rarely change, so they are
+fetched once per invocation and kept on disk for the next ones, for up to
+REPORTS_CACHE_TTL seconds."""
+
+import contextlib
+import hashlib
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import msgspec
+
+from .api import client
+from .cache import CACHE_DIR, atomic_write, cache_enabled, prune_size, read_cached
+
+REPORTS_CACHE_DIR = CACHE_DIR / "reports"
+REPORTS_CACHE_MAX_SIZE = 256 * 1024 * 1024  # 256MB
+REPORTS_CACHE_TTL = 60 * 60  # 1 hour, visibility or team may change elsewhere
+SEARCH_CURSORS_TTL = 300  # 5 minutes
+TERMINAL_STATUSES = frozenset({"Completed", "Stopped", "Timeout"})
+REPORT_ID_REGEX = re.compile(r"[\w-]+")
+
+_responses: dict[Path, bytes] = {}
+_statuses: dict[str, str] = {}
+
+
+def _account() -> str:
+    # Keep the entries of each host and token apart, access may differ
+    return hashlib.sha256(
+        f"{client.base_url}\0{client.headers.get('Authorization', '')}".encode()
+    ).hexdigest()[:16]
+
+
+def _cache_path(kind: str, report_id: str, unredacted: bool) -> Optional[Path]:
+    # Unredacted data holds secrets, it is never written to disk
+    if unredacted or not REPORT_ID_REGEX.fullmatch(report_id):
+        return None
+
+    return REPORTS_CACHE_DIR / _account() / f"{kind}-{report_id}.json"
+
+
+def _read(path: Optional[Path]) -> Optional[bytes]:
+    if path is None:
+        return None
+
+    if (data := _responses.get(path)) is not None:
+        return data
+
+    if not cache_enabled():
+        return None
+
+    # The mtime is when it was fetched, prune_size drops the oldest first
+    try:
+        expired = time.time() - path.stat().st_mtime > REPORTS_CACHE_TTL
+    except OSError:
+        return None
+
+    if expired:
+        with contextlib.suppress(OSError):
+            path.unlink()
+        return None
+
+    if (data := read_cached(path)) is None:
+        return None
+
+    _responses[path] = data
+    return data
+
+
+def _store(path: Optional[Path], data: bytes) -> None:
+    if path is None:
+        return
+
+    _responses[path] = data
+
+    if cache_enabled():
+        with contextlib.suppress(OSError):
+            atomic_write(path, data)
+            prune_size(REPORTS_CACHE_DIR, "*/*.json", REPORTS_CACHE_MAX_SIZE)
+
+
+def set_status(report_id: str, status: str) -> None:
+    """Remember a status already fetched, saves a request in get_outputs"""
+
+    _statuses[report_id] = status
+
+
+class _Status(msgspec.Struct):
+    status: Optional[str] = None
+
+
+def get_report_raw(report_id: str, unredacted: bool = False) -> bytes:
+    path = _cache_path("report", report_id, unredacted)
+
+    if (data := _read(path)) is None:
+        data = client.get(
+            f"/reports/{report_id}", params={"unredacted": unredacted}
+        ).content
+        status = msgspec.json.decode(data, type=_Status).status
+
+        if status in TERMINAL_STATUSES:
+            _store(path, data)
+    else:
+        status = msgspec.json.decode(data, type=_Status).status
+
+    if status is not None:
+        set_status(report_id, status)
+
+    return data
+
+
+def get_report(report_id: str, unredacted: bool = False, type: Any = Any) -> Any:
+    """Report decoded as type, plain builtins by default"""
+
+    return msgspec.json.decode(get_report_raw(report_id, unredacted), type=type)
+
+
+def get_outputs_raw(report_id: str, unredacted: bool = False) -> bytes:
+    path = _cache_path("outputs", report_id, unredacted)
+
+    if (data := _read(path)) is None:
+        # The status must be known before fetching, the outputs of a report
+        # that finishes in between would be incomplete
+        status = _statuses.get(report_id)
+        if status is None and path is not None:
+            status = client.get(f"/reports/{report_id}/status").text
+
+        data = client.get(
+            f"/outputs/{report_id}", params={"unredacted": unredacted}
+        ).content
+
+        if status in TERMINAL_STATUSES:
+            _store(path, data)
+
+    return data
+
+
+def get_outputs(report_id: str, unredacted: bool = False, type: Any = Any) -> Any:
+    """Outputs decoded as type, plain builtins by default"""
+
+    return msgspec.json.decode(get_outputs_raw(report_id, unredacted), type=type)
+
+
+def invalidate(report_id: str) -> None:
+    """Forget a report after it was modified or deleted"""
+
+    _statuses.pop(report_id, None)
+
+    for kind in ("report", "outputs"):
+        if path := _cache_path(kind, report_id, False):
+            _responses.pop(path, None)
+            with contextlib.suppress(OSError):
+                path.unlink()
+
+
+def clear() -> None:
+    """Forget every report of the account, after changes to many reports"""
+
+    _statuses.clear()
+    _responses.clear()
+    shutil.rmtree(REPORTS_CACHE_DIR / _account(), ignore_errors=True)
+
+
+class _SearchCursors(msgspec.Struct):
+    created: float
+    cursors: dict[int, str] = {}
+
+
+def _search_cursors_path(search: str) -> Path:
+    key = hashlib.sha256(search.encode()).hexdigest()[:32]
+    return REPORTS_CACHE_DIR / _account() / f"search-{key}.json"
+
+
+def get_search_cursors(search: str) -> dict[int, str]:
+    """Cursors of the pages of a search seen in the last SEARCH_CURSORS_TTL
+    seconds, by page number. search identifies the filters, page size and
+    first cursor of the search."""
+
+    if not cache_enabled() or not (data := read_cached(_search_cursors_path(search))):
+        return {}
+
+    try:
+        entry = msgspec.json.decode(data, type=_SearchCursors)
+    except msgspec.MsgspecError:
+        return {}
+
+    if time.time() - entry.created > SEARCH_CURSORS_TTL:
+        return {}
+    return entry.cursors
+
+
+def store_search_cursors(search: str, cursors: dict[int, str]) -> None:
+    """Save the cursors of a search, the TTL counts from the first save"""
+
+    if not cache_enabled():
+        return
+
+    path = _search_cursors_path(search)
+    created = time.time()
+    if data := read_cached(path):
+        with contextlib.suppress(msgspec.MsgspecError):
+            entry = msgspec.json.decode(data, type=_SearchCursors)
+            if created - entry.created <= SEARCH_CURSORS_TTL:
+                created = entry.created
+                cursors = entry.cursors | cursors
+
+    with contextlib.suppress(OSError):
+        atomic_write(
+            path, msgspec.json.encode(_SearchCursors(created=created, cursors=cursors))
+        )
@@ -0,0 +1,298 @@
+"""Local index of the reports saved by reports download.
+
+The fields the search filters use are loaded once into an SQLite database in
+the download folder and the outputs into an FTS5 trigram table, so queries
+don't read the saved files again. SQLite builds without the trigram tokenizer
+(older than 3.34) keep the outputs in a plain table searched with LIKE.
+Reports added by a later download are indexed by the next query.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import re
+import sqlite3
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+import msgspec
+
+from .models import DownloadedReport
+from .pack import PACK_DIR, PACK_INDEX, PackReader
+
+INDEX_NAME = ".satori-index.sqlite"
+INDEX_VERSION = "1"
+INDEX_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS reports (
+    id TEXT PRIMARY KEY,
+    result TEXT,
+    status TEXT,
+    playbook_path TEXT,
+    playbook_name TEXT,
+    playbook_type TEXT,
+    visibility TEXT,
+    monitor TEXT,
+    execution TEXT,
+    repo TEXT,
+    date TEXT
+);
+CREATE INDEX IF NOT EXISTS reports_date ON reports (date);
+CREATE TABLE IF NOT EXISTS severities (id TEXT, severity TEXT);
+CREATE INDEX IF NOT EXISTS severities_severity ON severities (severity);
+"""
+OUTPUTS_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS outputs
+    USING fts5(id UNINDEXED, output, tokenize='trigram')
+"""
+OUTPUTS_TABLE = "CREATE TABLE IF NOT EXISTS outputs (id TEXT, output TEXT)"
+TABLES = ("meta", "reports", "severities", "outputs")
+RESULT_COLUMNS = (
+    "id",
+    "playbook_path",
+    "playbook_name",
+    "execution",
+    "status",
+    "result",
+    "date",
+)
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+def _date(value: Any) -> Optional[str]:
+    """ISO date without timezone, comparable with the --from and --to dates"""
+
+    if not isinstance(value, str):
+        return _text(value)
+    try:
+        date = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    return date.replace(tzinfo=None).isoformat()
+
+
+def _decode_report(data: bytes) -> DownloadedReport:
+    for decode in (msgspec.json.decode, msgspec.msgpack.decode):
+        with contextlib.suppress(msgspec.MsgspecError):
+            return decode(data, type=DownloadedReport)
+    return DownloadedReport()
+
+
+def _severities(report: DownloadedReport) -> set[str]:
+    if not isinstance(report.report, list):
+        return set()
+    return {
+        str(item["severity"])
+        for item in report.report
+        if isinstance(item, dict) and item.get("severity") is not None
+    }
+
+
+def _source_signature(root: Path) -> str:
+    signature = []
+    for path in (root / PACK_DIR / PACK_INDEX, root / "outputs", root / "reports"):
+        try:
+            stat = path.stat()
+            signature.append([str(path), stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            continue
+    return json.dumps(signature)
+
+
+def _iter_saved(root: Path, known: set[str]) -> Iterator[tuple[str, str, bytes]]:
+    """(id, output, report) of the saved reports missing from known"""
+
+    if PackReader.exists(root):
+        for packed in PackReader(root):
+            if packed.id not in known:
+                yield packed.id, packed.output, packed.report
+        return
+
+    with contextlib.suppress(FileNotFoundError), os.scandir(root / "outputs") as it:
+        for entry in it:
+            report_id = entry.name.removesuffix(".txt")
+            if report_id in known or not entry.name.endswith(".txt"):
+                continue
+            with contextlib.suppress(OSError):
+                output = Path(entry.path).read_text(errors="replace")
+                report = (root / "reports" / entry.name).read_bytes()
+                yield report_id, output, report
+
+
+@lru_cache
+def _has_trigram() -> bool:
+    with contextlib.closing(sqlite3.connect(":memory:")) as db:
+        try:
+            db.execute(OUTPUTS_FTS)
+        except sqlite3.OperationalError:
+            return False
+    return True
+
+
+@lru_cache
+def _compile(pattern: str, case_sensitive: bool) -> re.Pattern:
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+class ReportIndex:
+    """Index of a download folder, opened and brought up to date on creation"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.db = sqlite3.connect(root / INDEX_NAME)
+        self._case_sensitive = False
+        self.db.create_function("regexp", 2, self._regexp, deterministic=True)
+        self.fts = _has_trigram()
+        # Indexes built with the other outputs table are rebuilt
+        version = INDEX_VERSION if self.fts else f"{INDEX_VERSION}-like"
+
+        self._create()
+        if self._meta("version") != version:
+            with self.db:
+                for table in TABLES:
+                    self.db.execute(f"DROP TABLE IF EXISTS {table}")  # nosec
+            self._create()
+            self._set_meta("version", version)
+
+        if self._meta("signature") != (signature := _source_signature(root)):
+            self.update()
+            self._set_meta("signature", signature)
+
+    def _create(self) -> None:
+        self.db.executescript(SCHEMA)
+        self.db.execute(OUTPUTS_FTS if self.fts else OUTPUTS_TABLE)
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self.db:
+            self.db.execute("REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def _regexp(self, pattern: str, value: Optional[str]) -> bool:
+        if value is None:
+            return False
+        return bool(_compile(pattern, self._case_sensitive).search(value))
+
+    def update(self) -> int:
+        """Index the saved reports that are not indexed yet"""
+
+        known = {row[0] for row in self.db.execute("SELECT id FROM reports")}
+        reports, severities, outputs = [], [], []
+        count = 0
+
+        for report_id, output, data in _iter_saved(self.root, known):
+            report = _decode_report(data)
+            reports.append(
+                (
+                    report_id,
+                    _text(report.result),
+                    _text(report.status),
+                    _text(report.playbook_path or report.playbook_uri),
+                    _text(report.playbook_name),
+                    _text(report.playbook_type),
+                    _text(report.visibility),
+                    _text(report.monitor),
+                    _text(report.execution),
+                    _text(report.repo),
+                    _date(report.date),
+                )
+            )
+            severities.extend((report_id, s) for s in _severities(report))
+            outputs.append((report_id, output))
+            count += 1
+
+            if len(reports) >= INDEX_BATCH_SIZE:
+                self._insert(reports, severities, outputs)
+
+        self._insert(reports, severities, outputs)
+        return count
+
+    def _insert(self, reports: list, severities: list, outputs: list) -> None:
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO reports VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                reports,
+            )
+            self.db.executemany("INSERT INTO severities VALUES (?, ?)", severities)
+            self.db.executemany("INSERT INTO outputs VALUES (?, ?)", outputs)
+        reports.clear()
+        severities.clear()
+        outputs.clear()
+
+    def search(self, filters: dict[str, Any]) -> list[dict[str, Any]]:
+        """Reports matching the same filters reports search sends to the API"""
+
+        where = []
+        params: list[Any] = []
+
+        for key, column in (
+            ("result", "result"),
+            ("status", "status"),
+            ("playbook_type", "playbook_type"),
+            ("report_visibility", "visibility"),
+            ("execution", "execution"),
+        ):
+            if filters.get(key):
+                where.append(f"lower({column}) = lower(?)")
+                params.append(filters[key])
+
+        for key in ("monitor", "repo"):
+            if filters.get(key):
+                where.append(f"{key} = ?")
+                params.append(filters[key])
+
+        if playbook := filters.get("playbook"):
+            where.append("? IN (playbook_path, playbook_name)")
+            params.append(playbook)
+
+        if from_date := filters.get("from_date"):
+            where.append("date >= ?")
+            params.append(from_date.isoformat())
+        if to_date := filters.get("to_date"):
+            where.append("date <= ?")
+            params.append(to_date.isoformat())
+
+        if severity := filters.get("severity"):
+            marks = ",".join("?" * len(severity))
+            where.append(
+                f"id IN (SELECT id FROM severities WHERE severity IN ({marks}))"
+            )
+            params.extend(severity)
+
+        if query := filters.get("query"):
+            if filters.get("regexp") == "1":
+                self._case_sensitive = filters.get("case_sensitive") == "1"
+                where.append("id IN (SELECT id FROM outputs WHERE output REGEXP ?)")
+                params.append(query)
+            elif len(query) >= 3 and self.fts:
+                # Trigram tokens match substrings, case insensitive
+                where.append("id IN (SELECT id FROM outputs WHERE outputs MATCH ?)")
+                params.append('"{}"'.format(query.replace('"', '""')))
+            else:
+                where.append(
+                    "id IN (SELECT id FROM outputs WHERE output LIKE ? ESCAPE '\\')"
+                )
+                escaped = re.sub(r"([%_\\])", r"\\\1", query)
+                params.append(f"%{escaped}%")
+
+        sql = f"SELECT {', '.join(RESULT_COLUMNS)} FROM reports"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY date DESC"
+
+        return [dict(zip(RESULT_COLUMNS, row)) for row in self.db.execute(sql, params)]
+
+    def close(self) -> None:
+        self.db.close()
@@ -1,9 +1,72 @@
+import contextlib
+import marshal
+import os
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
 
+from .cache import CACHE_DIR, atomic_write, cache_enabled, read_cached
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+# Parsed credentials, holds the tokens so only the user can read it
+CONFIG_CACHE = CACHE_DIR / "config.marshal"
+CONFIG_CACHE_VERSION = 1
+
+
+def safe_load(stream):
+    """Same as yaml.safe_load but using the libyaml parser when available"""
+
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+@lru_cache(maxsize=None)
+def _load_playbook(path: Path, mtime_ns: int, size: int):
+    return safe_load(path.read_bytes())
+
+
+def load_playbook(path):
+    """Parse a playbook file once per invocation.
+
+    The result is memoized by path, mtime and size and the same tree is handed
+    to validation, bundling and settings extraction, so it must not be mutated.
+    """
+
+    stat = os.stat(path)
+    return _load_playbook(Path(path).resolve(), stat.st_mtime_ns, stat.st_size)
+
+
+def _config_signature(locations: tuple[Path, ...]) -> list:
+    signature: list = [CONFIG_CACHE_VERSION]
+    for location in locations:
+        try:
+            stat = location.stat()
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append([str(location.absolute()), stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def _load_cached_config(signature: list):
+    if not cache_enabled() or (data := read_cached(CONFIG_CACHE)) is None:
+        return None
+
+    try:
+        cached_signature, config = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    return config if cached_signature == signature else None
+
 
 def load_config(config_path=None):
+    """Merged credential files, the parsed result is cached in binary form
+    until one of the files changes"""
+
     config = {}
     
     if config_path:
@@ -17,11 +80,15 @@ def load_config(config_path=None):
             Path.home() / ".satori_credentials.yml",
         )
 
+    signature = _config_signature(locations)
+    if (cached := _load_cached_config(signature)) is not None:
+        return cached
+
     for location in locations:
         if not location.is_file():
             continue
         try:
-            config.update(yaml.safe_load(location.read_text()))
+            config.update(safe_load(location.read_bytes()))
         except yaml.YAMLError as e:
             raise Exception(f"Error parsing YAML from {location}: {str(e)}")
         except Exception as e:
@@ -31,6 +98,11 @@ def load_config(config_path=None):
         paths_checked = "\n  - ".join(str(p) for p in locations)
         raise Exception(f"No valid configuration file found in the following locations:\n  - {paths_checked}")
 
+    if config and cache_enabled():
+        # Anything marshal can't store (e.g. YAML dates) is just not cached
+        with contextlib.suppress(OSError, ValueError):
+            atomic_write(CONFIG_CACHE, marshal.dumps([signature, config]), 0o600)
+
     return config
 
 
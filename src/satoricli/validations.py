@@ -1,45 +1,61 @@
+import os
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Optional
 
-import yaml
-from flatdict import FlatDict
 from satorici.validator import (
     INPUT_REGEX,
     is_command_group,
     is_import_group,
+    is_input_group,
     validate_playbook,
 )
 from satorici.validator.exceptions import NoExecutionsError, PlaybookVariableError
 
+from .utils import load_playbook
+
+
+def iter_leaves(
+    config: dict, path: tuple[str, ...] = ()
+) -> Iterator[tuple[tuple[str, ...], Any]]:
+    """Yields (path, value) of every non mapping value, depth first"""
+
+    for key, value in config.items():
+        current = (*path, str(key))
+
+        if isinstance(value, dict) and value:
+            yield from iter_leaves(value, current)
+        else:
+            yield current, value
+
+
+def get_unbound(commands: list[str], path: tuple[str, ...], defined: set[tuple]):
+    """Yields the variables of commands not defined by a previous sibling of
+    path or of any of its parents. defined holds every prefix of the paths
+    preceding path"""
 
-def get_unbound(commands: list[str], key: str, flat_config: dict[str]):
     variables = set()
 
     for command in commands:
         variables.update(INPUT_REGEX.findall(command))
 
-    keys: list[str] = flat_config.keys()
-    previous_paths = keys[: keys.index(key)]
-
-    path = key.split(":")
-    levels = len(path)
-
     for variable in variables:
-        prefixes = tuple(":".join(path[:i] + [variable]) for i in range(levels))
-        valid_prefixes = [path for path in previous_paths if path.startswith(prefixes)]
-
-        if not valid_prefixes:
+        if not any((*path[:i], variable) in defined for i in range(len(path))):
             yield variable
 
 
 def get_parameters(config: dict):
     """Returns the needed parameters from the yaml loaded config"""
 
-    flat_config = FlatDict(config)
     parameters: set[str] = set()
+    defined: set[tuple] = set()
 
-    for key, value in flat_config.items():
+    for path, value in iter_leaves(config):
         if is_command_group(value):
-            parameters.update(get_unbound(value, key, flat_config))
+            parameters.update(get_unbound(value, path, defined))
+
+        defined.update(path[:i] for i in range(1, len(path) + 1))
 
     return parameters
 
@@ -50,36 +66,111 @@ def validate_parameters(params: dict):
             return True
 
 
-def has_executions(config: dict, base_dir: Path):
-    flat_config = FlatDict(config)
-    imports: set[str] = set()
-
-    for value in flat_config.values():
-        if is_import_group(value):
-            for i in value:
-                if i.startswith("satori"):
-                    return True
-
-                imports.add(i)
-        elif is_command_group(value):
-            return True
-
-    for i in imports:
-        path = base_dir / i[7:]
+class PlaybookNode:
+    """Local references of a single playbook, collected in one walk"""
+
+    def __init__(self, config: dict):
+        self.imports: set[str] = set()  # file:// imports, without the scheme
+        self.inputs: set[str] = set()
+        self.remote = False  # Imports satori:// playbooks
+        self.commands = False
+
+        for _path, value in iter_leaves(config):
+            if is_import_group(value):
+                for i in value:
+                    if i.startswith("satori"):
+                        self.remote = True
+                    elif i.startswith("file"):
+                        self.imports.add(i[7:])
+            elif is_input_group(value):
+                self.inputs.update(
+                    p["file"] for p in value[0] if isinstance(p, dict) and p.get("file")
+                )
+            elif is_command_group(value):
+                self.commands = True
+
+
+class ImportGraph:
+    """A playbook and every local playbook it imports, transitively.
+
+    Each imported file is parsed and walked once, files imported more than once
+    or through a cycle are not followed again. Missing or invalid imports are
+    kept as None so they are still listed as references.
+    """
+
+    def __init__(self, config: dict, base_dir: Path):
+        self.base_dir = base_dir
+        self.root = PlaybookNode(config)
+        self.nodes: dict[str, Optional[PlaybookNode]] = {}
+
+        pending = list(self.root.imports)
+        while pending:
+            name = pending.pop()
+            if name in self.nodes:
+                continue
+
+            self.nodes[name] = node = self._load(name)
+            if node:
+                pending.extend(node.imports)
+
+    def _load(self, name: str) -> Optional[PlaybookNode]:
+        path = self.base_dir / name
 
         if not path.is_file():
-            continue
+            return None
 
         try:
-            imported = yaml.safe_load((base_dir / i[7:]).read_text())
+            imported = load_playbook(path)
             validate_playbook(imported)
         except (PlaybookVariableError, NoExecutionsError):
             pass
         except Exception:
-            continue
+            return None
+
+        return PlaybookNode(imported)
+
+    def __iter__(self):
+        yield self.root
+        yield from filter(None, self.nodes.values())
+
+    def has_executions(self) -> bool:
+        return any(node.remote or node.commands for node in self)
+
+    def local_files(self) -> dict[str, set[str]]:
+        inputs: set[str] = set()
+        for node in self:
+            inputs.update(node.inputs)
+
+        return {"imports": set(self.nodes), "inputs": inputs}
+
+    def unimported_ymls(self) -> list[Path]:
+        """.satori.yml files under base_dir, other than the root one, that are
+        not part of the graph"""
+
+        root = self.base_dir.resolve()
+        imported = {(root / name).resolve() for name in self.nodes}
+        imported.add(root / ".satori.yml")
+        found = []
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            if ".git" in dirnames:
+                dirnames.remove(".git")
+
+            if ".satori.yml" in filenames:
+                path = Path(dirpath, ".satori.yml")
+                if path not in imported and path.is_file():
+                    found.append(path)
+
+        return found
+
+
+@lru_cache(maxsize=None)
+def _import_graph(path: Path, mtime_ns: int, size: int) -> ImportGraph:
+    return ImportGraph(load_playbook(path), path.parent)
+
 
-        for value in FlatDict(imported).values():
-            if is_command_group(value):
-                return True
+def import_graph(playbook: Path) -> ImportGraph:
+    """Import graph of a playbook file, built once per invocation"""
 
-    return False
+    stat = os.stat(playbook)
+    return _import_graph(Path(playbook).resolve(), stat.st_mtime_ns, stat.st_size)
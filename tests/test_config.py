@@ -0,0 +1,30 @@
+import os
+import stat
+
+from satoricli import utils
+from satoricli.utils import load_config
+
+
+def test_config_cache_follows_the_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "CONFIG_CACHE", tmp_path / "cache/config.marshal")
+    credentials = tmp_path / ".satori_credentials.yml"
+    credentials.write_text("default:\n  token: one\n")
+
+    assert load_config(tmp_path) == {"default": {"token": "one"}}
+    assert stat.S_IMODE(utils.CONFIG_CACHE.stat().st_mode) == 0o600
+    assert load_config(tmp_path) == {"default": {"token": "one"}}
+
+    credentials.write_text("default:\n  token: two\n")
+    os.utime(credentials, ns=(1, 1))
+
+    assert load_config(tmp_path) == {"default": {"token": "two"}}
+
+
+def test_config_cache_is_not_used_for_other_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "CONFIG_CACHE", tmp_path / "config.marshal")
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / ".satori_credentials.yml").write_text(f"{name}: {{}}\n")
+
+    assert load_config(tmp_path / "a") == {"a": {}}
+    assert load_config(tmp_path / "b") == {"b": {}}
@@ -0,0 +1,180 @@
+import email.policy
+import io
+import json
+import os
+import shutil
+import tarfile
+import threading
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from satoricli import packet as packet_module
+from satoricli.cli.commands.run import delta_fields, upload_packet
+from satoricli.packet import (
+    MANIFEST_NAME,
+    DeltaPacket,
+    hash_tree,
+    manifest_digest,
+)
+
+
+class Storage:
+    """Stand-in for the storage endpoint, keeps the tree of the last upload"""
+
+    def __init__(self, root: Path, track_manifests: bool = True):
+        self.root = root
+        self.track_manifests = track_manifests
+        self.uploads: list[list[str]] = []
+        root.mkdir()
+
+    def upload_data(self, url: str) -> dict:
+        data: dict = {"url": url, "fields": {}}
+        if self.track_manifests:
+            data["manifest"] = self.digest()
+        return data
+
+    def digest(self):
+        tree = hash_tree(self.root)
+        return manifest_digest(tree) if tree else None
+
+    def receive(self, data: bytes) -> None:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
+            members = tar.getmembers()
+            self.uploads.append([member.name for member in members])
+
+            if MANIFEST_NAME in tar.getnames():
+                manifest = tar.extractfile(MANIFEST_NAME).read()  # type: ignore
+                deleted = json.loads(manifest)["deleted"]
+                for rel in sorted(deleted, reverse=True):
+                    path = self.root / rel
+                    if path.is_dir() and not path.is_symlink():
+                        shutil.rmtree(path)
+                    elif os.path.lexists(path):
+                        path.unlink()
+                members = [m for m in members if m.name != MANIFEST_NAME]
+            else:
+                shutil.rmtree(self.root)
+                self.root.mkdir()
+
+            for member in members:
+                target = self.root / member.name
+                if os.path.lexists(target) and not target.is_dir():
+                    target.unlink()
+            tar.extractall(self.root, members, filter="tar")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(packet_module, "MANIFEST_CACHE_DIR", tmp_path / "manifests")
+    storage = Storage(tmp_path / "storage")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            message = BytesParser(policy=email.policy.default).parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+                + body
+            )
+            for part in message.iter_parts():
+                if part.get_param("name", header="content-disposition") == "file":
+                    storage.receive(part.get_payload(decode=True))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    storage.url = f"http://127.0.0.1:{server.server_port}/"  # type: ignore
+    yield storage
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def source(tmp_path):
+    root = tmp_path / "source"
+    (root / "src").mkdir(parents=True)
+    (root / "empty").mkdir()
+    (root / "README.md").write_text("readme")
+    (root / "src/main.py").write_text("print(1)")
+    (root / "src/util.py").write_text("x = 1")
+    (root / "link").symlink_to("README.md")
+    return root
+
+
+def tree(root: Path) -> dict[str, str]:
+    return {rel: entry[2] for rel, entry in hash_tree(root).items()}
+
+
+def upload(storage: Storage, source: Path) -> DeltaPacket:
+    packet = DeltaPacket(source, False)
+    upload_packet(storage.upload_data(storage.url), packet)  # type: ignore
+    return packet
+
+
+def test_first_upload_is_full(storage, source):
+    upload(storage, source)
+
+    assert MANIFEST_NAME not in storage.uploads[-1]
+    assert tree(storage.root) == tree(source)
+
+
+def test_delta_carries_changed_entries(storage, source):
+    upload(storage, source)
+
+    (source / "src/main.py").write_text("print(2)")
+    (source / "src/util.py").unlink()
+    (source / "empty").rmdir()
+    (source / "new").mkdir()
+    (source / "link").unlink()
+    (source / "link").symlink_to("src")
+    upload(storage, source)
+
+    assert sorted(storage.uploads[-1]) == [
+        MANIFEST_NAME,
+        "link",
+        "new",
+        "src/main.py",
+    ]
+    assert tree(storage.root) == tree(source)
+    assert (storage.root / "link").readlink() == Path("src")
+
+
+def test_unchanged_tree_sends_manifest_only(storage, source):
+    upload(storage, source)
+    upload(storage, source)
+
+    assert storage.uploads[-1] == [MANIFEST_NAME]
+
+
+def test_storage_digest_mismatch_sends_full_packet(storage, source):
+    upload(storage, source)
+    (storage.root / "README.md").write_text("changed remotely")
+
+    upload(storage, source)
+
+    assert MANIFEST_NAME not in storage.uploads[-1]
+    assert tree(storage.root) == tree(source)
+
+
+def test_storage_without_manifests_skips_hashing(storage, source, tmp_path):
+    storage.track_manifests = False
+
+    packet = upload(storage, source)
+
+    assert packet.manifest is None
+    assert not (tmp_path / "manifests").exists()
+    assert tree(storage.root) == tree(source)
+
+
+def test_manifest_is_only_sent_with_delta(source, tmp_path, monkeypatch):
+    monkeypatch.setattr(packet_module, "MANIFEST_CACHE_DIR", tmp_path / "manifests")
+
+    assert delta_fields(str(source)) == {}
+    assert delta_fields(None) == {}
+    assert delta_fields(DeltaPacket(source, False)) == {"manifest": ""}
@@ -0,0 +1,178 @@
+import json
+import os
+import re
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import httpx
+import pytest
+
+from satoricli import download
+from satoricli.download import DownloadError, RangedDownload
+
+RANGE_REGEX = re.compile(r"bytes=(\d+)-(\d+)")
+
+
+class RangeServer(ThreadingHTTPServer):
+    """Serves data with HTTP ranges, optionally misbehaving"""
+
+    def __init__(self, data: bytes):
+        super().__init__(("127.0.0.1", 0), RangeHandler)
+        self.data = data
+        self.cut_after: Optional[int] = None  # Drop connections after these bytes
+        self.max_body: Optional[int] = None  # Send complete but short ranges
+        self.total: Optional[int] = None  # Size in Content-Range
+        self.ranges = True
+        self.requests: list[str] = []
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/archive.tar.gz"
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    server: RangeServer
+
+    def do_GET(self):
+        server = self.server
+        data = server.data
+        header = self.headers.get("Range", "")
+        server.requests.append(header)
+
+        match = RANGE_REGEX.fullmatch(header)
+        if not server.ranges or not match:
+            self.send_response(200)
+            body = data
+        else:
+            start, end = int(match[1]), int(match[2])
+            end = min(end, len(data) - 1)
+            if server.max_body is not None:
+                end = min(end, start + server.max_body - 1)
+            body = data[start : end + 1]
+            total = server.total if server.total is not None else len(data)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if server.cut_after is not None and len(body) > 1:
+            # Advertise the whole range, then drop the connection
+            body = body[: server.cut_after]
+            self.wfile.write(body)
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+        with server.lock:
+            server.sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def data() -> bytes:
+    return os.urandom(256 * 1024)
+
+
+@pytest.fixture
+def server(data, monkeypatch):
+    # Small files still get several segments
+    monkeypatch.setattr(download, "MIN_SEGMENT_SIZE", 16 * 1024)
+    monkeypatch.setattr(download, "STATE_SAVE_INTERVAL", 16 * 1024)
+
+    server = RangeServer(data)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_segments_match_source(server, data, tmp_path):
+    path = tmp_path / "archive.tar.gz"
+
+    RangedDownload(server.url, path, len(data), "key").run()
+
+    assert path.read_bytes() == data
+    assert len([r for r in server.requests if r != "bytes=0-0"]) == 4
+    assert not (tmp_path / "archive.tar.gz.part").exists()
+    assert not (tmp_path / "archive.tar.gz.part.json").exists()
+
+
+def test_resume_after_connections_drop(server, data, tmp_path):
+    path = tmp_path / "archive.tar.gz"
+    state_path = tmp_path / "archive.tar.gz.part.json"
+    server.cut_after = 20 * 1024
+
+    with pytest.raises(httpx.TransportError):
+        RangedDownload(server.url, path, len(data), "key").run()
+
+    state = json.loads(state_path.read_text())
+    received = sum(segment[2] for segment in state["segments"])
+    assert 0 < received < len(data)
+    assert not path.exists()
+
+    server.cut_after = None
+    server.requests.clear()
+    server.sent = 0
+    resumed = RangedDownload(server.url, path, len(data), "key")
+    assert resumed.received == received
+
+    resumed.run()
+
+    assert path.read_bytes() == data
+    # Only the missing bytes were requested again, plus the range probe
+    assert server.sent == len(data) - received + 1
+    assert not state_path.exists()
+
+
+def test_state_of_another_key_is_ignored(server, data, tmp_path):
+    path = tmp_path / "archive.tar.gz"
+    server.cut_after = 20 * 1024
+
+    with pytest.raises(httpx.TransportError):
+        RangedDownload(server.url, path, len(data), "key").run()
+
+    assert RangedDownload(server.url, path, len(data), "other").received == 0
+    assert RangedDownload(server.url, path, len(data) + 1, "key").received == 0
+
+
+def test_short_ranges_end_early(server, data, tmp_path):
+    server.max_body = 1024
+
+    with pytest.raises(DownloadError, match="ended early"):
+        RangedDownload(server.url, tmp_path / "archive.tar.gz", len(data)).run()
+
+
+def test_size_mismatch(server, data, tmp_path):
+    server.total = len(data) + 10
+
+    with pytest.raises(DownloadError, match=f"has {len(data) + 10} bytes"):
+        RangedDownload(server.url, tmp_path / "archive.tar.gz", len(data)).run()
+
+
+def test_server_without_ranges(server, data, tmp_path):
+    path = tmp_path / "archive.tar.gz"
+    server.ranges = False
+
+    RangedDownload(server.url, path, len(data)).run()
+
+    assert path.read_bytes() == data
+    assert len(server.requests) == 2
+
+
+@pytest.mark.parametrize("data", [b""])
+def test_empty_file(server, data, tmp_path):
+    path = tmp_path / "archive.tar.gz"
+
+    RangedDownload(server.url, path, 0).run()
+
+    assert path.read_bytes() == b""
+    assert not server.requests
@@ -0,0 +1,52 @@
+import json
+
+from satoricli.cli.commands.reports import DOWNLOAD_MANIFEST, DownloadManifest
+
+
+def entries(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_legacy_steps_follow_artifacts(tmp_path):
+    (tmp_path / "outputs").mkdir()
+    (tmp_path / "reports").mkdir()
+    for report_id in ("extracted", "no-files", "no-report"):
+        (tmp_path / "outputs" / f"{report_id}.txt").write_text("output")
+    for report_id in ("extracted", "no-files"):
+        (tmp_path / "reports" / f"{report_id}.txt").write_text("report")
+    (tmp_path / "extracted").mkdir()
+
+    manifest = DownloadManifest(tmp_path)
+    manifest.close()
+
+    assert manifest.complete_ids() == {"extracted"}
+    assert manifest.missing("no-files") == {"files"}
+    assert manifest.missing("no-report") == {"report", "files"}
+    # Written once, the next load finds the same steps
+    assert DownloadManifest(tmp_path).steps == manifest.steps
+
+
+def test_repeated_and_cut_lines_are_compacted(tmp_path):
+    path = tmp_path / DOWNLOAD_MANIFEST
+    lines = [json.dumps({"id": "r1", "step": step}) for step in ("output", "report")]
+    path.write_text("\n".join(lines * 3) + "\n" + '{"id": "r2", "st')
+
+    manifest = DownloadManifest(tmp_path)
+    manifest.record("r2", "output")
+    manifest.close()
+
+    assert entries(path) == [
+        {"id": "r1", "step": "output"},
+        {"id": "r1", "step": "report"},
+        {"id": "r2", "step": "output"},
+    ]
+
+
+def test_clean_manifest_is_not_rewritten(tmp_path):
+    path = tmp_path / DOWNLOAD_MANIFEST
+    path.write_text(json.dumps({"id": "r1", "step": "report"}) + "\n")
+    inode = path.stat().st_ino
+
+    DownloadManifest(tmp_path).close()
+
+    assert path.stat().st_ino == inode
@@ -0,0 +1,185 @@
+import json
+
+import msgspec
+
+from satoricli.models import (
+    BootstrapTable,
+    CommandOutput,
+    DownloadedReport,
+    Output,
+    ReportResult,
+    SearchCursor,
+    SearchPage,
+    SearchRow,
+)
+
+# Shaped like the API responses, with the fields the CLI doesn't declare too
+REPORT = {
+    "id": "r4kq8vz2mb7tyx1c",
+    "team": "Private",
+    "user": "octocat",
+    "playbook_name": "Ping",
+    "playbook_path": "satori://network/ping.yml",
+    "playbook_uri": "satori://network/ping.yml",
+    "playbook_type": "public",
+    "report_url": "https://satori.ci/report_details/?n=r4kq8vz2mb7tyx1c",
+    "execution": "Run",
+    "visibility": "Private",
+    "monitor": None,
+    "repo": None,
+    "execution_time": 12.5,
+    "date": "2024-05-01T10:00:00",
+    "status": "Completed",
+    "result": "Fail(2)",
+    "fails": 2,
+    "user_warnings": ["HOST was not set, using the default"],
+    "run_params": "run ./ --sync --data HOST=example.com",
+    "secrets_count": 1,
+    "testcases": 2,
+    "errors": None,
+    "report": [
+        {
+            "test": "ping",
+            "result": "Fail",
+            "asserts": [
+                {"assert": "assertReturnCode", "expected": 0, "status": "Fail"}
+            ],
+        }
+    ],
+}
+
+OUTPUTS = [
+    {
+        "path": "ping:run",
+        "original": "ping -c1 ${{HOST}}",
+        "output": {
+            "return_code": 0,
+            "stdout": "1 packets transmitted, 1 received",
+            "stderr": "",
+            "os_error": None,
+            "time": 0.021,
+        },
+        "testcase": {"HOST": "example.com"},
+    },
+    {
+        "path": "ls:run",
+        "original": "ls /missing",
+        "output": {
+            "return_code": 2,
+            "stdout": "",
+            "stderr": "ls: cannot access '/missing'",
+            "os_error": None,
+            "time": 0.001,
+        },
+        "testcase": None,
+    },
+]
+
+SEARCH_PAGE = {
+    "total": 2,
+    "last_id": "r0c1d2e3f4g5h6i7",
+    "rows": [
+        {
+            "id": "r4kq8vz2mb7tyx1c",
+            "run_params": "run ./ --sync",
+            "playbook_path": "satori://network/ping.yml",
+            "playbook_name": "Ping",
+            "execution": "Run",
+            "status": "Completed",
+            "result": "Pass",
+            "execution_time": 12.5,
+            "date": "2024-05-01T10:00:00",
+        },
+        {
+            "id": "r0c1d2e3f4g5h6i7",
+            "run_params": None,
+            "playbook_uri": "satori://network/dns.yml",
+            "playbook_name": None,
+            "execution": "Monitor",
+            "status": "Running",
+            "result": None,
+            "run_time": 3,
+            "date": "2024-05-01T10:05:00",
+        },
+    ],
+}
+
+TABLE = {
+    "total": 2,
+    "totalNotFiltered": 5,
+    "rows": [{"id": "m1", "status": "Running"}, {"id": "m2", "status": "Paused"}],
+    "last_id": "m2",
+    "last_timestamp": "2024-05-01T10:05:00",
+    "finished": True,
+}
+
+
+def decode(payload, type):
+    return msgspec.json.decode(json.dumps(payload).encode(), type=type)
+
+
+def matching_fields(struct: type[msgspec.Struct], payload: dict) -> set[str]:
+    """Fields of struct present in payload, after checking the decoded values
+    match json"""
+
+    decoded = decode(payload, struct)
+    expected = json.loads(json.dumps(payload))
+    present = set(struct.__struct_fields__) & expected.keys()
+
+    for name in present:
+        assert msgspec.to_builtins(getattr(decoded, name)) == expected[name], name
+
+    return present
+
+
+def test_report_result():
+    assert matching_fields(ReportResult, REPORT) == set(
+        ReportResult.__struct_fields__
+    )
+
+
+def test_downloaded_report():
+    assert matching_fields(DownloadedReport, REPORT) == set(
+        DownloadedReport.__struct_fields__
+    )
+
+
+def test_outputs():
+    # Set by the CLI, never sent
+    local = {"filtered_result"}
+    for payload in OUTPUTS:
+        assert matching_fields(Output, payload) == set(Output.__struct_fields__) - local
+        assert matching_fields(CommandOutput, payload["output"]) == set(
+            CommandOutput.__struct_fields__
+        )
+
+    outputs = decode(OUTPUTS, list[Output])
+    assert [o.output.present() for o in outputs] == [o["output"] for o in OUTPUTS]
+
+
+def test_search_page():
+    # The rows are checked as SearchRow below
+    page = {key: value for key, value in SEARCH_PAGE.items() if key != "rows"}
+    assert matching_fields(SearchPage, page) | {"rows"} == set(
+        SearchPage.__struct_fields__
+    )
+
+    # Each row has either the path or the uri, and the runtime or run time
+    present = set()
+    for payload in SEARCH_PAGE["rows"]:
+        present |= matching_fields(SearchRow, payload)
+    assert present == set(SearchRow.__struct_fields__)
+
+    first, second = decode(SEARCH_PAGE, SearchPage).rows
+    assert (first.path, first.runtime) == ("satori://network/ping.yml", 12.5)
+    assert (second.path, second.runtime) == ("satori://network/dns.yml", 3)
+
+
+def test_search_cursor():
+    assert matching_fields(SearchCursor, SEARCH_PAGE) == {"last_id"}
+
+
+def test_bootstrap_table():
+    assert matching_fields(BootstrapTable, TABLE) == set(
+        BootstrapTable.__struct_fields__
+    )
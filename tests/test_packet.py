@@ -0,0 +1,25 @@
+from satoricli.packet import iter_tree
+
+
+def test_iter_tree_is_sorted(tmp_path):
+    for name in ("b", "a", "c"):
+        (tmp_path / name).mkdir()
+        for child in ("z.txt", "m.txt", "a.txt"):
+            (tmp_path / name / child).write_text(child)
+    (tmp_path / "0.txt").write_text("")
+
+    assert [rel for _path, rel in iter_tree(tmp_path)] == [
+        "0.txt",
+        "a",
+        "b",
+        "c",
+        "a/a.txt",
+        "a/m.txt",
+        "a/z.txt",
+        "b/a.txt",
+        "b/m.txt",
+        "b/z.txt",
+        "c/a.txt",
+        "c/m.txt",
+        "c/z.txt",
+    ]
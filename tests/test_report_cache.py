@@ -0,0 +1,45 @@
+import os
+import time
+
+import pytest
+
+from satoricli import report_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "REPORTS_CACHE_DIR", tmp_path)
+    monkeypatch.delenv("SATORI_CLI_NO_CACHE", raising=False)
+    yield tmp_path
+    report_cache._responses.clear()
+    report_cache._statuses.clear()
+
+
+def cached(report_id: str):
+    path = report_cache._cache_path("report", report_id, False)
+    report_cache._store(path, b'{"status": "Completed"}')
+    report_cache._responses.clear()  # Like a new invocation
+    return path
+
+
+def test_entries_expire():
+    path = cached("r1")
+    assert report_cache._read(path) is not None
+
+    report_cache._responses.clear()
+    fetched = time.time() - report_cache.REPORTS_CACHE_TTL - 1
+    os.utime(path, (fetched, fetched))
+
+    assert report_cache._read(path) is None
+    assert not path.exists()
+
+
+def test_clear_forgets_every_report():
+    paths = [cached("r1"), cached("r2")]
+    report_cache.set_status("r1", "Completed")
+
+    report_cache.clear()
+
+    assert not any(path.exists() for path in paths)
+    assert all(report_cache._read(path) is None for path in paths)
+    assert not report_cache._statuses
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from satoricli import report_index
+from satoricli.report_index import ReportIndex
+
+OUTPUTS = {
+    "r1": "Connection refused by example.com",
+    "r2": "PING example.org: 1 packets received",
+    "r3": "100% packet loss",
+}
+
+
+@pytest.fixture(params=[True, False], ids=["fts", "like"])
+def index(request, tmp_path, monkeypatch):
+    # Without the trigram tokenizer, like SQLite older than 3.34
+    monkeypatch.setattr(report_index, "_has_trigram", lambda: request.param)
+
+    (tmp_path / "outputs").mkdir()
+    (tmp_path / "reports").mkdir()
+    for report_id, output in OUTPUTS.items():
+        (tmp_path / "outputs" / f"{report_id}.txt").write_text(output)
+        (tmp_path / "reports" / f"{report_id}.txt").write_text(
+            json.dumps({"status": "Completed", "date": f"2024-05-0{report_id[1]}"})
+        )
+
+    index = ReportIndex(tmp_path)
+    yield index
+    index.close()
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("example", ["r2", "r1"]),
+        ("PACKET", ["r3", "r2"]),
+        ("%", ["r3"]),
+        ("no match", []),
+    ],
+)
+def test_search_outputs(index, query, expected):
+    assert [row["id"] for row in index.search({"query": query})] == expected
+
+
+def test_index_is_rebuilt_for_the_other_mode(index, tmp_path, monkeypatch):
+    index.close()
+    monkeypatch.setattr(report_index, "_has_trigram", lambda: not index.fts)
+
+    reopened = ReportIndex(tmp_path)
+
+    assert reopened.fts != index.fts
+    assert [row["id"] for row in reopened.search({"query": "loss"})] == ["r3"]
+    reopened.close()
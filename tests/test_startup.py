@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+# Only the commands that use them may import these
+HEAVY_MODULES = {
+    "git",
+    "msgspec",
+    "numpy",
+    "paramiko",
+    "rich.markdown",
+    "rich.syntax",
+    "satori_runner",
+    "satorici",
+    "satoricli.models",
+    "satoricli.report_cache",
+    "websockets",
+}
+
+SCRIPT = """
+import sys
+from satoricli.cli import RootCommand
+sys.argv = ["satori", *sys.argv[1:]]
+RootCommand().parse_args()
+"""
+
+
+def imported_modules(*args: str) -> set[str]:
+    """Modules python -X importtime reports for parsing a command line"""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+@pytest.mark.parametrize("args", [(), ("whoami",), ("config", "token")])
+def test_light_commands_skip_heavy_imports(args):
+    modules = imported_modules(*args)
+
+    assert "satoricli.cli" in modules
+    assert not {
+        module
+        for module in modules
+        if module in HEAVY_MODULES or module.split(".")[0] in HEAVY_MODULES
+    }
@@ -0,0 +1,94 @@
+import random
+import time
+
+from flatdict import FlatDict
+from satorici.validator import INPUT_REGEX, is_command_group
+
+from satoricli.validations import get_parameters
+
+DEFINED = 40  # Only the first ones are ever defined
+REFERENCED = 60
+
+
+def previous_get_parameters(config: dict) -> set[str]:
+    """The FlatDict traversal get_parameters replaced, O(keys² × vars)"""
+
+    flat_config = FlatDict(config)
+    keys = list(flat_config.keys())
+    parameters: set[str] = set()
+
+    for key, value in flat_config.items():
+        if not is_command_group(value):
+            continue
+
+        variables = {v for command in value for v in INPUT_REGEX.findall(command)}
+        previous_paths = keys[: keys.index(key)]
+        path = key.split(":")
+
+        for variable in variables:
+            prefixes = tuple(
+                ":".join(path[:i] + [variable]) for i in range(len(path))
+            )
+            if not any(p.startswith(prefixes) for p in previous_paths):
+                parameters.add(variable)
+
+    return parameters
+
+
+def referenced(config: dict) -> set[str]:
+    return {
+        variable
+        for value in FlatDict(config).values()
+        if is_command_group(value)
+        for command in value
+        for variable in INPUT_REGEX.findall(command)
+    }
+
+
+def variable(rng: random.Random, pool: int) -> str:
+    # Same length names, none is a prefix of another
+    return f"VAR{rng.randrange(pool):03d}X"
+
+
+def build_playbook(rng: random.Random, depth: int = 0) -> dict:
+    node: dict = {variable(rng, DEFINED): ["echo value"] for _ in range(2)}
+    for i in range(rng.randint(3, 8)):
+        roll = rng.random()
+        if roll < 0.15:
+            node[variable(rng, DEFINED)] = ["echo value"]
+        elif roll < 0.5 and depth < 4:
+            node[f"group{i}"] = build_playbook(rng, depth + 1)
+        else:
+            references = (
+                f"${{{{{variable(rng, REFERENCED)}}}}}"
+                for _ in range(rng.randint(0, 3))
+            )
+            node[f"test{i}"] = ["echo " + " ".join(references)]
+    return node
+
+
+def test_large_playbook_matches_previous_traversal():
+    rng = random.Random(34)
+    config = {f"suite{i}": build_playbook(rng) for i in range(12)}
+    assert len(FlatDict(config)) > 2000
+
+    start = time.perf_counter()
+    parameters = get_parameters(config)
+    elapsed = time.perf_counter() - start
+
+    assert parameters == previous_get_parameters(config)
+    assert elapsed < 1
+
+    # Across all suites every variable ends up unbound somewhere, each suite
+    # alone also has bound ones
+    for suite in config.values():
+        suite_parameters = get_parameters(suite)
+        assert suite_parameters == previous_get_parameters(suite)
+        assert suite_parameters <= referenced(suite)
+    assert any(get_parameters(s) < referenced(s) for s in config.values())
+
+
+def test_prefix_of_a_key_is_not_a_definition():
+    config = {"VARIABLE": ["echo"], "test": {"run": ["echo ${{VAR}}"]}}
+
+    assert get_parameters(config) == {"VAR"}